@@ -1,3 +1,3 @@
 """ initializing modules"""
 
-from .user import RegisterLoginAPIView
+from .user import RegisterLoginAPIView, TokenRefreshAPIView, TokenRevokeAPIView
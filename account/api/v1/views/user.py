@@ -1,8 +1,8 @@
 """
-Handles user registration and login functionality.
+Handles user registration, login and API tokens.
 
 This module supports registering new users and logging in existing users based on email
-and password.
+and password, refreshing the bearer tokens issued at login and revoking them.
 """
 
 import logging
@@ -13,6 +13,8 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from account import tokens
+
 from ..serializers import UserSerializer
 
 
@@ -24,6 +26,9 @@ class RegisterLoginAPIView(APIView):
     """
     Manages user registration and login.
 
+    Both start a session and return a bearer token pair (see `account.tokens`): send
+    the access token as `Authorization: Bearer <token>` and exchange the refresh
+    token at `TokenRefreshAPIView` when it expires.
     """
 
     permission_classes = [permissions.AllowAny]
@@ -35,6 +40,7 @@ class RegisterLoginAPIView(APIView):
         Scenario:
         - Registers a new user if the email doesn't exist.
         - Logs in the user if email and password are correct.
+        - Issues an access and refresh token pair in both cases.
         - Returns errors for missing fields or incorrect credentials.
 
         Returns:
@@ -59,7 +65,11 @@ class RegisterLoginAPIView(APIView):
                 login(request, user)
                 logger.info("User %s logged in successfully.", user.id)
                 return Response(
-                    {"message": "Login successful", "user": UserSerializer(user).data},
+                    {
+                        "message": "Login successful",
+                        "user": UserSerializer(user).data,
+                        **tokens.issue_tokens(user),
+                    },
                 )
 
             if User.objects.filter(email=email).exists():
@@ -78,6 +88,7 @@ class RegisterLoginAPIView(APIView):
                 {
                     "message": "Registration successful",
                     "user": UserSerializer(user).data,
+                    **tokens.issue_tokens(user),
                 },
                 status=status.HTTP_201_CREATED,
             )
@@ -88,3 +99,90 @@ class RegisterLoginAPIView(APIView):
                 {"error": "An error occurred during registration/login."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class TokenRefreshAPIView(APIView):
+    """
+    Exchanges a refresh token for a new token pair.
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        """
+        Issue new tokens for a valid refresh token.
+
+        Scenario:
+        - Verifies the signature and age of the refresh token.
+        - Rejects it if the user was deactivated or their tokens were revoked since.
+        - Returns a new access and refresh token pair otherwise.
+
+        Returns:
+        - 200 OK with the new tokens.
+        - 400 Bad Request if no refresh token is provided.
+        - 401 Unauthorized if the token is invalid, expired or revoked.
+        """
+        try:
+            refresh = request.data.get("refresh")
+
+            if not refresh or not isinstance(refresh, str):
+                return Response(
+                    {"error": "A refresh token is required."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            try:
+                claims = tokens.read_token(refresh, tokens.REFRESH)
+            except tokens.InvalidToken:
+                return Response(
+                    {"error": "Invalid or expired refresh token."},
+                    status=status.HTTP_401_UNAUTHORIZED,
+                )
+
+            user = tokens.token_user(claims)
+            if user is None:
+                logger.warning("Revoked refresh token used for user %s", claims["uid"])
+                return Response(
+                    {"error": "Refresh token has been revoked."},
+                    status=status.HTTP_401_UNAUTHORIZED,
+                )
+
+            logger.info("Tokens refreshed for user %s.", user.id)
+            return Response(tokens.issue_tokens(user))
+
+        except Exception as e:
+            logger.error("Error during token refresh: %s", str(e))
+            return Response(
+                {"error": "An error occurred during token refresh."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class TokenRevokeAPIView(APIView):
+    """
+    Revokes every token issued to the requesting user, on all devices.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        """
+        Revoke the user's access and refresh tokens.
+
+        Returns:
+        - 204 No Content once the tokens are revoked.
+        - 500 Internal Server Error if an exception occurs.
+        """
+        try:
+            tokens.revoke_tokens(request.user)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        except Exception as e:
+            logger.error(
+                "Error revoking tokens of user %s: %s", request.user.id, str(e)
+            )
+            return Response(
+                {"error": "An error occurred while revoking tokens."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -8,3 +8,9 @@ from django.apps import AppConfig
 class AccountConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "account"
+
+    def ready(self):
+        """
+        Connects the signal handlers that invalidate cached account data.
+        """
+        from . import signals
@@ -0,0 +1,48 @@
+"""
+DRF authentication with the signed bearer tokens issued by `RegisterLoginAPIView`.
+"""
+
+import logging
+
+from rest_framework import authentication, exceptions
+
+from . import tokens
+
+
+logger = logging.getLogger(__name__)
+
+
+class BearerTokenAuthentication(authentication.BaseAuthentication):
+    """
+    Authenticates requests sent with `Authorization: Bearer <access token>`.
+
+    The token's HMAC signature and age are checked and the user is read from the user
+    cache, whose token version must match the token's (see `account.tokens`), so a
+    valid request costs no password hash and no query.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        header = authentication.get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(header) != 2:
+            raise exceptions.AuthenticationFailed(
+                "Invalid bearer header. Token string should not contain spaces."
+            )
+
+        try:
+            claims = tokens.read_token(header[1].decode("ascii"), tokens.ACCESS)
+        except (tokens.InvalidToken, UnicodeError):
+            raise exceptions.AuthenticationFailed("Invalid or expired token.")
+
+        user = tokens.token_user(claims)
+        if user is None:
+            logger.warning("Revoked token used for user %s", claims["uid"])
+            raise exceptions.AuthenticationFailed("Token has been revoked.")
+
+        return user, claims
+
+    def authenticate_header(self, request):
+        return self.keyword
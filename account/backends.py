@@ -0,0 +1,20 @@
+"""
+Authentication backend that resolves session users from the user cache.
+"""
+
+from django.contrib.auth.backends import ModelBackend
+
+from .cache import user_cache
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose `get_user`, called on every request with a logged in session,
+    reads the versioned user cache (see `account.cache`) instead of the database.
+
+    Credentials are still checked against the database by `authenticate`.
+    """
+
+    def get_user(self, user_id):
+        user = user_cache.get(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
@@ -0,0 +1,56 @@
+"""
+Versioned cache of users.
+
+Authenticated requests resolve their user from this cache instead of the database,
+through the session backend (`CachedModelBackend`) and bearer token authentication.
+It is a `warehouse.cache.VersionedCache` keyed by user id: saving, deleting or
+revoking the tokens of a user bumps the version, so a password change or
+deactivation takes effect on the next request. The backend is the
+`ACCOUNT_CACHE_ALIAS` Django cache; use a shared one (Redis, Memcached) when running
+several workers, or the other workers keep the old user until it expires.
+"""
+
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from warehouse.cache import VersionedCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache(VersionedCache):
+    """
+    Caches user instances per id and version.
+    """
+
+    def __init__(self, alias=None, timeout=None):
+        super().__init__(
+            "account:user",
+            alias=alias or getattr(settings, "ACCOUNT_CACHE_ALIAS", "default"),
+            timeout=timeout,
+        )
+
+    def get(self, user_id):
+        """
+        Returns the user with the given id, or None if there is none.
+
+        Users are always read from the primary database, so unlike `get_or_set` the
+        cached copy is used whatever database the request reads from.
+        """
+        key = f"{self.namespace}:{user_id}:{self.version(user_id)}"
+        user = self.backend.get(key)
+        if user is not None:
+            self._count(hit=True)
+            return user
+
+        self._count(hit=False)
+        user = get_user_model()._default_manager.filter(pk=user_id).first()
+        if user is not None:
+            self.backend.set(key, user, timeout=self.timeout)
+        return user
+
+
+user_cache = UserCache(timeout=getattr(settings, "USER_CACHE_TIMEOUT", 300))
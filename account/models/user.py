@@ -19,6 +19,8 @@ class User(AbstractUser, TimeStampMixin):
     - Inherits from AbstractUser for standard user management.
     - Adds unique email validation and timestamp fields for creation and modification
     tracking.
+    - Keeps a token version that is embedded in API tokens; incrementing it revokes
+    every token issued before (see `account.tokens`).
     """
 
     email = models.EmailField(
@@ -28,3 +30,19 @@ class User(AbstractUser, TimeStampMixin):
         error_messages={"unique": "This email is already taken."},
         help_text="The email of the user.",
     )
+    token_version = models.PositiveIntegerField(
+        _("Token version"),
+        default=0,
+        help_text="Incremented to revoke every API token issued to the user.",
+    )
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the user, revoking the API tokens issued before a password change.
+        """
+        if self._password is not None and not self._state.adding:
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "password" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
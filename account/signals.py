@@ -0,0 +1,22 @@
+"""
+Signal handlers that keep cached account data in sync with writes.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import user_cache
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    """
+    Invalidates the cached copy of a changed or deleted user, so a password change,
+    deactivation or deletion ends their sessions and rejects their tokens right away.
+    """
+    user_cache.bump_on_commit(instance.pk)
@@ -0,0 +1,156 @@
+"""
+Tests of the signed bearer tokens and their revocation.
+"""
+
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import exceptions
+from rest_framework.test import APIClient, APIRequestFactory
+
+from . import tokens
+from .authentication import BearerTokenAuthentication
+
+
+class BearerTokenTests(TestCase):
+    """
+    Checks which access tokens `BearerTokenAuthentication` accepts.
+    """
+
+    def setUp(self):
+        # Users are cached per id across tests; ids are reused after a rollback.
+        for cache in caches.all():
+            cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="reader@example.com",
+            email="reader@example.com",
+            password="secret-password",
+        )
+        self.tokens = tokens.issue_tokens(self.user)
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return BearerTokenAuthentication().authenticate(request)
+
+    def assertRejected(self, token):
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_valid_access_token(self):
+        user, claims = self.authenticate(self.tokens["access"])
+        self.assertEqual(user, self.user)
+        self.assertEqual(claims["uid"], self.user.pk)
+
+    def test_valid_access_token_runs_no_queries(self):
+        self.authenticate(self.tokens["access"])
+        with self.assertNumQueries(0):
+            self.authenticate(self.tokens["access"])
+
+    def test_tampered_token(self):
+        payload, signature = self.tokens["access"].rsplit(":", 1)
+        other = tokens.make_token(
+            get_user_model().objects.create_user(
+                username="other@example.com", email="other@example.com"
+            ),
+            tokens.ACCESS,
+        )
+        self.assertRejected(f"{payload}:{signature[::-1]}")
+        # Another user's claims with this token's signature.
+        other_payload = other.split(":", 1)[0]
+        signed_part = self.tokens["access"].split(":", 1)[1]
+        self.assertRejected(f"{other_payload}:{signed_part}")
+        self.assertRejected("not-a-token")
+
+    def test_expired_token(self):
+        expired = time.time() + tokens.lifetime(tokens.ACCESS) + 1
+        with mock.patch("time.time", return_value=expired):
+            self.assertRejected(self.tokens["access"])
+
+    def test_refresh_token_used_as_access_token(self):
+        self.assertRejected(self.tokens["refresh"])
+
+    def test_revoked_tokens(self):
+        self.authenticate(self.tokens["access"])
+        with self.captureOnCommitCallbacks(execute=True):
+            tokens.revoke_tokens(self.user)
+        self.assertRejected(self.tokens["access"])
+
+    def test_password_change(self):
+        self.authenticate(self.tokens["access"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password("new-password")
+            self.user.save()
+        self.assertRejected(self.tokens["access"])
+        self.authenticate(tokens.issue_tokens(self.user)["access"])
+
+    def test_deactivated_user(self):
+        self.authenticate(self.tokens["access"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertRejected(self.tokens["access"])
+
+    def test_deleted_user(self):
+        self.authenticate(self.tokens["access"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertRejected(self.tokens["access"])
+
+
+class TokenEndpointTests(TestCase):
+    """
+    Checks the refresh and revoke endpoints.
+    """
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="reader@example.com",
+            email="reader@example.com",
+            password="secret-password",
+        )
+        self.tokens = tokens.issue_tokens(self.user)
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post(
+            reverse("auth-refresh"), {"refresh": token}, format="json"
+        )
+
+    def revoke(self, token):
+        return self.client.post(
+            reverse("auth-revoke"), HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+
+    def test_refresh(self):
+        response = self.refresh(self.tokens["refresh"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["token_type"], "Bearer")
+        self.assertEqual(self.revoke(response.data["access"]).status_code, 204)
+
+    def test_access_token_used_as_refresh_token(self):
+        self.assertEqual(self.refresh(self.tokens["access"]).status_code, 401)
+
+    def test_requests_after_revoke(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.revoke(self.tokens["access"]).status_code, 204)
+        self.assertEqual(self.revoke(self.tokens["access"]).status_code, 401)
+        self.assertEqual(self.refresh(self.tokens["refresh"]).status_code, 401)
+
+    def test_refresh_after_password_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password("new-password")
+            self.user.save()
+        self.assertEqual(self.refresh(self.tokens["refresh"]).status_code, 401)
+
+    def test_refresh_after_deactivation(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.refresh(self.tokens["refresh"]).status_code, 401)
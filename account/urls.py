@@ -4,9 +4,15 @@ URL configuration for account app.
 
 from django.urls import path
 
-from .api.v1.views import RegisterLoginAPIView
+from .api.v1.views import (
+    RegisterLoginAPIView,
+    TokenRefreshAPIView,
+    TokenRevokeAPIView,
+)
 
 
 urlpatterns = [
     path("auth/", RegisterLoginAPIView.as_view(), name="auth"),
+    path("auth/refresh/", TokenRefreshAPIView.as_view(), name="auth-refresh"),
+    path("auth/revoke/", TokenRevokeAPIView.as_view(), name="auth-revoke"),
 ]
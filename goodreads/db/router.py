@@ -0,0 +1,196 @@
+"""
+Database router that sends the reads of safe requests to read replicas.
+
+Reads go to a replica only while `ReadReplicaMiddleware` marks the current request as
+eligible: a GET, HEAD or OPTIONS request outside the admin whose user has not written
+recently. Everything else (writes, unsafe and admin requests, management commands,
+reads inside a transaction on the primary, and the auth, session and account tables)
+uses the primary, `default`.
+
+After a successful unsafe request the client is pinned to the primary for
+`REPLICA_PIN_SECONDS`, by a cookie and, for authenticated users, by a cache entry, so
+a user always reads their own writes even while the replicas lag behind. Replicas
+are listed in `DATABASE_REPLICAS`; with none configured the router changes nothing.
+"""
+
+import contextvars
+import logging
+import random
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.decorators import sync_and_async_middleware
+
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Apps whose tables are always read from the primary: credentials, sessions and
+# permissions must never be stale.
+PRIMARY_APPS = {"account", "admin", "auth", "contenttypes", "sessions"}
+
+PIN_COOKIE = "read_primary"
+
+_request = contextvars.ContextVar("replica_request", default=None)
+
+
+def replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", 30)
+
+
+def _pin_key(user_id):
+    return f"read-primary:{user_id}"
+
+
+def is_pinned(request):
+    """
+    Returns whether the request's client wrote recently and must read from the
+    primary.
+    """
+    if PIN_COOKIE in request.COOKIES:
+        return True
+    user = getattr(request, "user", None)
+    return bool(
+        user is not None
+        and user.is_authenticated
+        and cache.get(_pin_key(user.pk)) is not None
+    )
+
+
+def pin(request, response):
+    """
+    Pins the client of a write request to the primary for `REPLICA_PIN_SECONDS`.
+    """
+    seconds = pin_seconds()
+    response.set_cookie(PIN_COOKIE, "1", max_age=seconds, httponly=True, samesite="Lax")
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        cache.set(_pin_key(user.pk), 1, seconds)
+
+
+class ReplicaRequest:
+    """
+    A request eligible for replica reads; the database is chosen on its first read.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.alias = None
+
+    def read_database(self):
+        if self.alias is None:
+            self.alias = (
+                DEFAULT_DB_ALIAS
+                if is_pinned(self.request)
+                else random.choice(replicas())
+            )
+        return self.alias
+
+
+def current_read_database():
+    """
+    Returns the database the current request's reads are routed to.
+    """
+    state = _request.get()
+    return DEFAULT_DB_ALIAS if state is None else state.read_database()
+
+
+def pinned_to_primary():
+    """
+    Returns whether the current request could read from a replica but is pinned to
+    the primary because its client wrote recently.
+    """
+    state = _request.get()
+    return state is not None and state.read_database() == DEFAULT_DB_ALIAS
+
+
+class ReadReplicaRouter:
+    """
+    Routes reads of eligible requests to a replica and everything else to the
+    primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _request.get()
+        if (
+            state is None
+            or model._meta.app_label in PRIMARY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return state.read_database()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary, schema included.
+        if db in replicas():
+            return False
+        return None
+
+
+def uses_replicas(request):
+    return (
+        bool(replicas())
+        and request.method in SAFE_METHODS
+        and not any(
+            request.path.startswith(prefix)
+            for prefix in getattr(settings, "REPLICA_EXCLUDED_PATHS", ("/admin/",))
+        )
+    )
+
+
+def finish(request, response):
+    """
+    Pins the client of a successful write request, if there are replicas to avoid.
+    """
+    if replicas() and request.method not in SAFE_METHODS and response.status_code < 400:
+        pin(request, response)
+    return response
+
+
+@sync_and_async_middleware
+def ReadReplicaMiddleware(get_response):
+    """
+    Marks safe requests as eligible for replica reads and pins writers to the
+    primary. Place it after AuthenticationMiddleware.
+    """
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            token = _request.set(
+                ReplicaRequest(request) if uses_replicas(request) else None
+            )
+            try:
+                response = await get_response(request)
+            finally:
+                _request.reset(token)
+            return finish(request, response)
+
+    else:
+
+        def middleware(request):
+            token = _request.set(
+                ReplicaRequest(request) if uses_replicas(request) else None
+            )
+            try:
+                response = get_response(request)
+            finally:
+                _request.reset(token)
+            return finish(request, response)
+
+    return middleware
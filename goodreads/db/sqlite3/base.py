@@ -0,0 +1,131 @@
+"""
+SQLite database backend tuned for concurrent web traffic.
+
+Use it with `"ENGINE": "goodreads.db.sqlite3"`. On top of Django's SQLite backend it
+
+- sets pragmas on every new connection: write-ahead logging, so readers and the
+  writer do not block each other, a busy timeout, `synchronous=NORMAL` (durable at
+  checkpoints, safe with WAL), a memory map and a larger page cache;
+- retries statements and `BEGIN` that fail with "database is locked" outside of a
+  transaction, a bounded number of times with exponential backoff and jitter.
+
+Work inside a transaction is never replayed: the failed statement may depend on
+earlier ones. With `"transaction_mode": "IMMEDIATE"` in `OPTIONS`, a transaction
+takes the write lock at `BEGIN`, which is retried, so it cannot fail later on a lock
+upgrade. Pair it with `CONN_MAX_AGE` to keep connections open between requests.
+
+Extra `OPTIONS`:
+
+- `pragmas`: pragma values overriding or extending `DEFAULT_PRAGMAS`;
+- `busy_retries`: attempts after the first failure (default 3);
+- `busy_retry_delay` / `busy_retry_max_delay`: first and largest backoff in seconds.
+"""
+
+import logging
+import random
+import time
+from functools import partial
+
+from django.db.backends.sqlite3 import base
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    # Milliseconds a statement waits for a lock before failing.
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    # Negative values are KiB: a 64 MiB page cache per connection.
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+# SQLITE_BUSY and SQLITE_LOCKED.
+BUSY_ERROR_CODES = {5, 6}
+
+
+def is_busy(error):
+    """
+    Returns whether an sqlite3 error means the database was locked by another
+    connection.
+    """
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in BUSY_ERROR_CODES
+    message = str(error).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+class BusyRetryCursorWrapper(base.SQLiteCursorWrapper):
+    """
+    Cursor that retries statements run in autocommit mode when the database is
+    busy.
+    """
+
+    wrapper = None
+
+    def execute(self, query, params=None):
+        return self.retry(partial(super().execute, query, params))
+
+    def executemany(self, query, param_list):
+        return self.retry(partial(super().executemany, query, list(param_list)))
+
+    def retry(self, run):
+        wrapper = self.wrapper
+        if wrapper is None or wrapper.in_atomic_block:
+            return run()
+        return wrapper.retry_busy(run)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite DatabaseWrapper with connection pragmas and busy retries.
+    """
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = {**DEFAULT_PRAGMAS, **kwargs.pop("pragmas", {})}
+        self.busy_retries = kwargs.pop("busy_retries", 3)
+        self.busy_retry_delay = kwargs.pop("busy_retry_delay", 0.05)
+        self.busy_retry_max_delay = kwargs.pop("busy_retry_max_delay", 1.0)
+        # The sqlite3 module sets its own busy handler from `timeout`, in seconds.
+        kwargs.setdefault("timeout", self.pragmas["busy_timeout"] / 1000)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            if name == "journal_mode" and self.is_in_memory_db():
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def create_cursor(self, name=None):
+        cursor = self.connection.cursor(factory=BusyRetryCursorWrapper)
+        cursor.wrapper = self
+        return cursor
+
+    def retry_busy(self, run):
+        """
+        Calls `run` until it does not fail with a busy error, at most
+        `busy_retries` more times, sleeping with exponential backoff in between.
+        """
+        delay = self.busy_retry_delay
+        for attempt in range(self.busy_retries + 1):
+            try:
+                return run()
+            except self.Database.OperationalError as e:
+                if not is_busy(e) or attempt == self.busy_retries:
+                    raise
+                pause = delay * random.uniform(0.5, 1.0)
+                logger.warning(
+                    "Database %s is busy, retrying in %.3fs (attempt %s of %s)",
+                    self.alias,
+                    pause,
+                    attempt + 1,
+                    self.busy_retries,
+                )
+                time.sleep(pause)
+                delay = min(delay * 2, self.busy_retry_max_delay)
@@ -0,0 +1,209 @@
+"""
+Keyset (cursor) pagination shared by the project's list endpoints.
+
+Pages are addressed by an opaque cursor that encodes the position of the last (or
+first) row of the previous page on a stable, unique ordering such as
+`("-created", "-id")`. Each page is fetched with a range condition on that ordering,
+so no `COUNT(*)` or growing `OFFSET` is needed and deep pages cost the same as the
+first one.
+"""
+
+import json
+import logging
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+logger = logging.getLogger(__name__)
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination over a composite, unique ordering.
+
+    - `ordering` must end with a unique field (usually `-id`) so every row has a
+      distinct position.
+    - Clients may ask for a smaller or larger page through `page_size_query_param`,
+      capped at `max_page_size`.
+    - Works with model instances as well as `values()` rows.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns one page of `queryset` positioned after the request's cursor.
+        """
+        queryset = self.page_queryset(queryset, request)
+        return self.set_page(list(queryset[: self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async variant of `paginate_queryset`, reading the page with `aiterator()`.
+        """
+        queryset = self.page_queryset(queryset, request)
+        results = [row async for row in queryset[: self.page_size + 1].aiterator()]
+        return self.set_page(results)
+
+    def page_queryset(self, queryset, request):
+        """
+        Orders `queryset` and narrows it to the rows after the request's cursor.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        self.position, self.reverse = self.decode_cursor(request)
+
+        ordering = self._invert(self.ordering) if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(
+                self._after(queryset.model, ordering, self.position)
+            )
+        return queryset
+
+    def set_page(self, results):
+        """
+        Keeps one page of `results`, fetched with one extra row, and returns it.
+        """
+        has_following = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.position is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        """
+        Returns the requested page size, bounded by `max_page_size`.
+        """
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def decode_cursor(self, request):
+        """
+        Returns the `(position, reverse)` pair encoded in the request's cursor.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position = payload["p"]
+            reverse = bool(payload.get("r", False))
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError("Cursor does not match the ordering.")
+            if not all(
+                isinstance(value, (str, int, float)) and not isinstance(value, bool)
+                for value in position
+            ):
+                raise ValueError("Cursor values must be non-null scalars.")
+        except (TypeError, ValueError, KeyError) as e:
+            logger.warning("Invalid pagination cursor %r: %s", encoded, str(e))
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        """
+        Returns the absolute URL of the page that starts after `position`.
+        """
+        payload = {"p": position}
+        if reverse:
+            payload["r"] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _position(self, item):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            value = item[name] if isinstance(item, dict) else getattr(item, name)
+            position.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return position
+
+    @staticmethod
+    def _invert(ordering):
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}" for field in ordering
+        )
+
+    @staticmethod
+    def _after(model, ordering, position):
+        """
+        Builds the keyset condition `(a, b, ...) > (x, y, ...)` for `ordering`.
+        """
+        values = []
+        for field, raw in zip(ordering, position):
+            name = field.lstrip("-")
+            try:
+                values.append(model._meta.get_field(name).to_python(raw))
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(KeysetCursorPagination.invalid_cursor_message)
+
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            term = Q(**{f"{name}__{lookup}": values[index]})
+            for previous, value in zip(ordering[:index], values[:index]):
+                term &= Q(**{previous.lstrip("-"): value})
+            condition |= term
+        return condition
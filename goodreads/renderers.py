@@ -0,0 +1,219 @@
+"""
+Response renderers used by the API.
+
+- `FastJSONRenderer` produces the same bytes as DRF's `JSONRenderer` but encodes with
+  `orjson` when it is installed, falling back to the standard library otherwise.
+- `MessagePackRenderer` encodes the same data as `application/msgpack`.
+- `CSVRenderer` encodes flat rows as `text/csv`, for exports.
+- The streaming renderers also encode an iterable of rows incrementally through
+  `stream()`, which list views hand to a `StreamingHttpResponse` (see
+  `goodreads.views.StreamingListMixin`), so a listing is sent while it is read from
+  the database.
+"""
+
+import abc
+import csv
+import io
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+import msgpack
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encoder_default(encoder_class):
+    """
+    Returns the `default` hook of a DRF JSON encoder, so other encoders convert
+    dates, decimals, lazy strings and the like exactly as the JSON output does.
+    """
+    return encoder_class().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with `orjson` when available.
+
+    The output is byte for byte the same as `JSONRenderer` with compact output:
+    types orjson does not handle natively, and dates, go through the DRF encoder's
+    `default`, and U+2028/U+2029 are escaped. Indented output (for example in the
+    browsable API) and data orjson rejects are encoded with the standard library.
+    """
+
+    orjson_options = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        if orjson
+        else 0
+    )
+
+    def __init__(self):
+        self.default = encoder_default(self.encoder_class)
+
+    def encode(self, data):
+        """
+        Returns `data` as compact JSON bytes.
+        """
+        if orjson is not None and self.compact and not self.ensure_ascii:
+            try:
+                encoded = orjson.dumps(
+                    data, default=self.default, option=self.orjson_options
+                )
+            except orjson.JSONEncodeError:
+                pass
+            else:
+                if b"\xe2\x80" in encoded:
+                    encoded = encoded.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                        b"\xe2\x80\xa9", b"\\u2029"
+                    )
+                return encoded
+        return super().render(data)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return self.encode(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders responses as MessagePack.
+
+    Values are converted like in the JSON output (see `encoder_default`), so a
+    client decodes the same document from either format.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    encoder_class = JSONRenderer.encoder_class
+
+    def __init__(self):
+        self.default = encoder_default(self.encoder_class)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=self.default, use_bin_type=True)
+
+
+class StreamingRenderer(FastJSONRenderer, abc.ABC):
+    """
+    Base class of the renderers that can encode rows one at a time.
+
+    `render()` still encodes a complete body, which is used for error responses.
+    """
+
+    # Content type of streamed responses.
+    content_type = "application/json"
+
+    # Encoded rows are joined into chunks of this many rows before being sent.
+    rows_per_chunk = 100
+
+    def encode_rows(self, rows):
+        """
+        Yields lists of at most `rows_per_chunk` JSON encoded rows.
+        """
+        chunk = []
+        for row in rows:
+            chunk.append(self.encode(row))
+            if len(chunk) >= self.rows_per_chunk:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @abc.abstractmethod
+    def stream(self, rows):
+        """
+        Yields the encoded body for `rows` as bytes.
+        """
+
+
+class JSONArrayStreamRenderer(StreamingRenderer):
+    """
+    Streams rows as a single JSON array.
+
+    Selected with `Accept: application/json; stream=true`; the body is the same
+    array a non-streaming client would parse, so it is served as `application/json`.
+    """
+
+    media_type = "application/json; stream=true"
+    format = "json-stream"
+
+    def stream(self, rows):
+        separator = b"["
+        for chunk in self.encode_rows(rows):
+            yield separator + b",".join(chunk)
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """
+    Streams rows as newline-delimited JSON, one object per line.
+
+    Selected with `Accept: application/x-ndjson`.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    content_type = "application/x-ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, list):
+            return b"".join(self.stream(data))
+        body = super().render(data, accepted_media_type, renderer_context)
+        return body + b"\n" if body else body
+
+    def stream(self, rows):
+        for chunk in self.encode_rows(rows):
+            yield b"\n".join(chunk) + b"\n"
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renders flat rows as CSV with a header line taken from the first row's keys.
+
+    `stream()` encodes rows incrementally like the streaming JSON renderers. A single
+    object, such as an error response, is rendered as a one-row table.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+    content_type = "text/csv; charset=utf-8"
+    rows_per_chunk = 100
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return b"".join(self.stream(data if isinstance(data, list) else [data]))
+
+    def stream(self, rows):
+        """
+        Yields the CSV encoded `rows` as bytes.
+        """
+        buffer = io.StringIO()
+        writer = None
+        count = 0
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            count += 1
+            if count % self.rows_per_chunk == 0:
+                yield buffer.getvalue().encode(self.charset)
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode(self.charset)
@@ -0,0 +1,81 @@
+"""
+Read-only serializers working directly on `values()` rows.
+
+List endpoints serialize many rows per request. Building model instances and running
+every row through `ModelSerializer` field objects costs far more than the query
+itself, so these serializers map plain dictionaries to the same JSON output with one
+precomputed getter per field.
+"""
+
+import logging
+from operator import itemgetter
+
+from django.conf import settings
+from django.utils import timezone
+
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+
+logger = logging.getLogger(__name__)
+
+# Stand-in primary key used to turn a reversed URL into a template.
+URL_PK_MARKER = 918273645
+
+
+def url_template(view_name, kwarg, request=None):
+    """
+    Reverses `view_name` once and returns the `(prefix, suffix)` around the object's
+    primary key, so each row's URL is a string concatenation instead of a `reverse()`.
+
+    Returns None if the URL cannot be reversed.
+    """
+    try:
+        url = reverse(view_name, kwargs={kwarg: URL_PK_MARKER}, request=request)
+    except Exception as e:
+        logger.error("Error in building URL template for %s: %s", view_name, str(e))
+        return None
+    prefix, suffix = url.rsplit(str(URL_PK_MARKER), 1)
+    return prefix, suffix
+
+
+class RowSerializer(serializers.BaseSerializer):
+    """
+    Serializes `values()` rows to dictionaries with the keys of `field_names`.
+
+    A field is read from `get_<field>(row)` if the subclass defines it, otherwise
+    from the row column named in `field_sources` (by default the field name itself).
+    Pass `fields=` to output only a subset, in `field_names` order.
+    """
+
+    field_names = ()
+    field_sources = {}
+
+    def __init__(self, instance=None, **kwargs):
+        selected = kwargs.pop("fields", None)
+        super().__init__(instance, **kwargs)
+        # The timezone is resolved once; DateTimeField otherwise looks up the current
+        # timezone for every value.
+        self.datetime_field = serializers.DateTimeField(
+            default_timezone=(
+                timezone.get_current_timezone() if settings.USE_TZ else None
+            )
+        )
+        self.getters = [
+            (
+                name,
+                getattr(self, f"get_{name}", None)
+                or itemgetter(self.field_sources.get(name, name)),
+            )
+            for name in self.field_names
+            if selected is None or name in selected
+        ]
+
+    def format_datetime(self, value):
+        """
+        Returns `value` formatted like DRF's DateTimeField.
+        """
+        return self.datetime_field.to_representation(value)
+
+    def to_representation(self, instance):
+        return {name: getter(instance) for name, getter in self.getters}
@@ -68,6 +68,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "goodreads.db.router.ReadReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -99,13 +100,68 @@ WSGI_APPLICATION = "goodreads.wsgi.application"
 
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# goodreads.db.sqlite3 enables WAL and other pragmas on connect and retries
+# statements that fail with "database is locked" (see goodreads/db/sqlite3/base.py).
+# IMMEDIATE transactions take the write lock at BEGIN, so they never fail later on
+# a lock upgrade. Connections are kept open between requests.
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "goodreads.db.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
+# Local SQLite read replicas (db.replica1.sqlite3, ...), copied from the primary with
+# `manage.py refresh_replicas`. Safe requests read from a replica; a client that
+# wrote is pinned to the primary for REPLICA_PIN_SECONDS, which should exceed the
+# refresh interval (see goodreads/db/router.py).
+DATABASE_REPLICAS = []
+for number in range(1, int(os.environ.get("SQLITE_READ_REPLICAS", "0")) + 1):
+    DATABASE_REPLICAS.append(f"replica{number}")
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"],
+        "NAME": BASE_DIR / f"db.replica{number}.sqlite3",
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["goodreads.db.router.ReadReplicaRouter"]
+
+REPLICA_PIN_SECONDS = 30
+
+
+####################################################
+#                     CACHES                       #
+####################################################
+
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# The local-memory cache is per process; point "default" at a shared backend
+# (Redis, Memcached) when running several workers or hosts.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "goodreads",
+    }
+}
+
+# Cache alias used for API payloads served by the warehouse app.
+WAREHOUSE_CACHE_ALIAS = "default"
+
+# Seconds a serialized book detail payload is kept.
+BOOK_DETAIL_CACHE_TIMEOUT = 300
+
+# Seconds a public book list page is kept. Bookmarks do not invalidate the pages, so
+# this is also how long their bookmark counts may lag behind.
+BOOK_LIST_CACHE_TIMEOUT = 60
+
+# Seconds the set of book ids bookmarked by a user is kept.
+USER_BOOKMARKS_CACHE_TIMEOUT = 3600
+
 
 ####################################################
 #               PASSWORD VALIDATION                #
@@ -168,10 +224,27 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "account.User"
 
+# CachedModelBackend resolves the user of a logged in session from the user cache
+# (see account/cache.py) instead of querying the database on every request.
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
+    "account.backends.CachedModelBackend",
 ]
 
+# Sessions are stored in a signed cookie, so reading one needs no query and logging
+# in writes no session row. Only the user id and auth hashes are stored in them.
+SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+
+# Lifetimes, in seconds, of the bearer tokens issued at login (see account/tokens.py).
+ACCESS_TOKEN_LIFETIME = 15 * 60
+
+REFRESH_TOKEN_LIFETIME = 14 * 24 * 3600
+
+# Cache alias and seconds for the users resolved by sessions and bearer tokens; a
+# cached user is also invalidated when it is saved or its tokens are revoked.
+ACCOUNT_CACHE_ALIAS = "default"
+
+USER_CACHE_TIMEOUT = 300
+
 
 ####################################################
 #                REST FRAMEWORK                    #
@@ -179,14 +252,32 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "account.authentication.BearerTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "goodreads.renderers.FastJSONRenderer",
+        "goodreads.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "goodreads.parsers.FastJSONParser",
+        "goodreads.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
 }
 
+# Basic authentication hashes the password (PBKDF2) on every request, which costs far
+# more CPU than the rest of a typical API call; it is only enabled on request.
+if os.environ.get("API_BASIC_AUTH") == "1":
+    REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"].append(
+        "rest_framework.authentication.BasicAuthentication"
+    )
+
 
 ####################################################
 #                    LOGGING                       #
@@ -0,0 +1,224 @@
+"""
+Base classes and mixins for API views.
+
+- `ConditionalGetMixin` answers GET requests with 304 Not Modified when the client's
+  validators are still current.
+- `StreamingListMixin` streams whole listings as NDJSON or a JSON array.
+- `AsyncAPIView` is the base class of native async, read-only API views.
+
+DRF views are synchronous, so under ASGI Django runs every one of them in the single
+thread it reserves for sync code, which caps the number of requests served at once.
+Views built on `AsyncAPIView` are coroutines from end to end: they read with Django's
+async ORM, serialize with serializers that do no I/O and encode with
+`FastJSONRenderer`, so only the database calls leave the event loop.
+"""
+
+import hashlib
+import logging
+
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views import View
+
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from asgiref.sync import sync_to_async
+
+from .renderers import (
+    FastJSONRenderer,
+    JSONArrayStreamRenderer,
+    NDJSONRenderer,
+    StreamingRenderer,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAPIView(View):
+    """
+    Async view that answers GET requests with JSON.
+
+    Subclasses implement `async def get(self, request, *args, **kwargs)` and return
+    `self.respond(data)`. `self.request` is a DRF `Request`, so pagination classes
+    and serializers can read `query_params`; `request.user` is resolved before the
+    handler runs.
+
+    The session is read with `request.auser()`. Requests with an `Authorization`
+    header are authenticated with the configured DRF authentication classes, which
+    are synchronous and run in a worker thread. DRF exceptions such as `NotFound`
+    and `ValidationError` are turned into the same JSON error bodies as in DRF views.
+    Only JSON is rendered; there is no content negotiation or browsable API.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    renderer = FastJSONRenderer()
+    vary_headers = ("Cookie", "Authorization")
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            user = await self.aauthenticate(request)
+            self.request = Request(request, authenticators=())
+            self.request.user = user
+            return await super().dispatch(self.request, *args, **kwargs)
+        except Http404 as e:
+            return self.respond({"detail": str(e) or "Not found."}, status=404)
+        except exceptions.APIException as e:
+            data = (
+                e.detail if isinstance(e.detail, (list, dict)) else {"detail": e.detail}
+            )
+            return self.respond(data, status=e.status_code)
+        except Exception as e:
+            logger.error("Error in %s: %s", type(self).__name__, str(e))
+            raise
+
+    async def aauthenticate(self, request):
+        """
+        Returns the user of the request's session or `Authorization` header.
+        """
+        if "HTTP_AUTHORIZATION" not in request.META:
+            return await request.auser()
+
+        def authenticate():
+            drf_request = Request(
+                request,
+                authenticators=[
+                    authenticator()
+                    for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+                ],
+            )
+            return drf_request.user
+
+        return await sync_to_async(authenticate)()
+
+    def respond(self, data, status=200, headers=None):
+        """
+        Returns `data` encoded as a JSON response.
+        """
+        response = HttpResponse(
+            self.renderer.encode(data),
+            content_type="application/json",
+            status=status,
+            headers=headers,
+        )
+        response["Vary"] = ", ".join(self.vary_headers)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    API view mixin that answers GET requests with 304 Not Modified when the client's
+    `If-None-Match` / `If-Modified-Since` validators are still current.
+
+    Subclasses implement `get_validators`, which should be a cheap query (for example
+    the latest `modified` timestamp and a row count). The body is only serialized when
+    the validators do not match.
+    """
+
+    # Request headers that make the response differ between clients.
+    conditional_vary_headers = ()
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Returns `(state, last_modified)`, where `state` is a tuple of values that
+        change whenever the response body changes and `last_modified` is a datetime.
+        Returns `(None, None)` when the resource cannot be validated.
+        """
+        return None, None
+
+    def get(self, request, *args, **kwargs):
+        state, last_modified = self.get_validators(request, *args, **kwargs)
+        if state is None:
+            return super().get(request, *args, **kwargs)
+
+        media_type = getattr(request, "accepted_media_type", None)
+        digest = hashlib.md5(
+            repr((request.get_full_path(), media_type, *state)).encode("utf-8"),
+            usedforsecurity=False,
+        ).hexdigest()
+        etag = f'"{digest}"'
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response.headers["ETag"] = etag
+        if timestamp is not None:
+            response.headers["Last-Modified"] = http_date(timestamp)
+        patch_vary_headers(response, ("Accept", *self.conditional_vary_headers))
+        return response
+
+
+class StreamingListMixin:
+    """
+    List view mixin that streams the whole, unpaginated listing to clients that
+    accept `application/x-ndjson` (one object per line) or
+    `application/json; stream=true` (one JSON array).
+
+    Rows are read with `.iterator(chunk_size=stream_chunk_size)` in the pagination
+    ordering, serialized by `get_stream_serializer()` and encoded as they arrive, so
+    memory use does not grow with the size of the listing. Other clients get the
+    regular paginated response.
+    """
+
+    stream_chunk_size = 1000
+
+    def get_renderers(self):
+        """
+        Adds the streaming renderers. The JSON array renderer comes first because
+        its media type is only matched by an explicit `stream=true`; NDJSON comes
+        last so `*/*` keeps selecting the default renderer.
+        """
+        return [JSONArrayStreamRenderer(), *super().get_renderers(), NDJSONRenderer()]
+
+    def is_streaming(self):
+        return isinstance(
+            getattr(self.request, "accepted_renderer", None), StreamingRenderer
+        )
+
+    def get_stream_serializer(self):
+        """
+        Returns the serializer whose `to_representation` is applied to each row.
+
+        Defaults to the view's serializer; views usually return a lighter one.
+        """
+        return self.get_serializer()
+
+    def get_stream_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = getattr(self.pagination_class, "ordering", None)
+        return queryset.order_by(*ordering) if ordering else queryset
+
+    def iter_rows(self, queryset, serializer):
+        """
+        Yields the serialized rows of `queryset`.
+        """
+        try:
+            for row in queryset.iterator(chunk_size=self.stream_chunk_size):
+                yield serializer.to_representation(row)
+        except Exception as e:
+            logger.error("Error in streaming %s: %s", self.request.path, str(e))
+            raise
+
+    def stream(self, request, *args, **kwargs):
+        """
+        Returns the streaming response. The queryset and serializer are built
+        before the first byte is sent, so invalid parameters still get an error
+        response.
+        """
+        renderer = request.accepted_renderer
+        rows = self.iter_rows(self.get_stream_queryset(), self.get_stream_serializer())
+        return StreamingHttpResponse(
+            renderer.stream(rows), content_type=renderer.content_type
+        )
+
+    def get(self, request, *args, **kwargs):
+        if self.is_streaming():
+            return self.stream(request, *args, **kwargs)
+        return super().get(request, *args, **kwargs)
@@ -1,4 +1,13 @@
 """ initializing modules"""
 
-from .book import BookDetailSerializer, BookSerializer
-from .review import ReviewSerializer
+from .book import (
+    BookDetailSerializer,
+    BookRowSerializer,
+    BookSerializer,
+)
+from .bookmark import BookmarkBatchSerializer
+from .review import (
+    ReviewBatchItemSerializer,
+    ReviewRowSerializer,
+    ReviewSerializer,
+)
@@ -7,28 +7,30 @@ information, including bookmarks and reviews.
 
 import logging
 
-from django.db import models
-
 from rest_framework import serializers
 from rest_framework.reverse import reverse
 
-from warehouse.models import Book, Review
+from goodreads.serializers import RowSerializer, url_template
+from warehouse.models import Book, BookStats
 
+from .mixins import SparseFieldsetMixin
 from .review import ReviewSerializer
 
 
 logger = logging.getLogger(__name__)
 
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializes basic book information with additional computed fields.
 
     Includes details about user-specific bookmark status and overall bookmark count.
+    Both are read from the `bookmarked_by_user` and `bookmark_count` annotations
+    provided by the view's queryset. Supports `?fields=` and `?omit=`.
     """
 
-    bookmarked_by_user = serializers.SerializerMethodField()
-    bookmark_count = serializers.SerializerMethodField()
+    bookmarked_by_user = serializers.BooleanField(read_only=True)
+    bookmark_count = serializers.IntegerField(read_only=True)
     details_url = serializers.SerializerMethodField()
 
     class Meta:
@@ -43,29 +45,6 @@ class BookSerializer(serializers.ModelSerializer):
             "details_url",
         )
 
-    def get_bookmarked_by_user(self, obj):
-        """
-        Returns whether the current user has bookmarked this book.
-        """
-        try:
-            user = self.context["request"].user
-            if user.is_authenticated:
-                return obj.bookmarks.filter(user=user).exists()
-            return False
-        except Exception as e:
-            logger.error("Error in checking bookmark status for user: %s", str(e))
-            return False
-
-    def get_bookmark_count(self, obj):
-        """
-        Returns the total number of bookmarks for this book.
-        """
-        try:
-            return obj.bookmarks.count()
-        except Exception as e:
-            logger.error("Error in counting bookmarks for book %s: %s", obj.id, str(e))
-            return 0
-
     def get_details_url(self, obj):
         """
         Returns the URL to the detailed view of this book.
@@ -80,15 +59,64 @@ class BookSerializer(serializers.ModelSerializer):
             return None
 
 
-class BookDetailSerializer(serializers.ModelSerializer):
+class BookRowSerializer(RowSerializer):
+    """
+    Read-only counterpart of BookSerializer for `values()` rows.
+
+    Rows carry `id`, `title` and the `bookmarked_by_user` / `bookmark_count`
+    annotations. `details_url` is built from a URL template reversed once per
+    serializer instead of once per book. The output is identical to BookSerializer.
+    """
+
+    field_names = BookSerializer.Meta.fields
+
+    def __init__(self, instance=None, **kwargs):
+        super().__init__(instance, **kwargs)
+        self.details_url = url_template(
+            "book-detail", "pk", request=self.context.get("request")
+        )
+        self.bookmarked_book_ids = self.context.get("bookmarked_book_ids")
+
+    def get_bookmarked_by_user(self, row):
+        """
+        Returns whether the current user bookmarked this book.
+        """
+        if self.bookmarked_book_ids is None:
+            return row["bookmarked_by_user"]
+        return row["id"] in self.bookmarked_book_ids
+
+    def get_details_url(self, row):
+        """
+        Returns the URL to the detailed view of this book.
+        """
+        if self.details_url is None:
+            return None
+        prefix, suffix = self.details_url
+        return f"{prefix}{row['id']}{suffix}"
+
+
+class BookDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializes detailed book information, including reviews and rating statistics.
 
     Provides a comprehensive view of a book's reviews, ratings, and distribution of
-    ratings.
+    ratings. Rating statistics are read from the book's denormalized BookStats row.
+    Only the latest reviews are embedded; `reviews_url` links to the paginated list.
+    Supports `?fields=` and `?omit=`.
     """
 
-    reviews = ReviewSerializer(many=True, read_only=True)
+    latest_reviews_limit = 5
+
+    # Fields read from the book's statistics row.
+    stats_fields = {
+        "review_count",
+        "rating_count",
+        "average_rating",
+        "rating_distribution",
+    }
+
+    reviews = serializers.SerializerMethodField()
+    reviews_url = serializers.SerializerMethodField()
     review_count = serializers.SerializerMethodField()
     rating_count = serializers.SerializerMethodField()
     average_rating = serializers.SerializerMethodField()
@@ -105,57 +133,73 @@ class BookDetailSerializer(serializers.ModelSerializer):
             "average_rating",
             "rating_distribution",
             "reviews",
+            "reviews_url",
         )
 
-    def get_rating_distribution(self, obj):
+    def get_reviews(self, obj):
         """
-        Returns the distribution of ratings for this book.
+        Returns the latest reviews of this book.
+
+        Async views read them beforehand and pass them as `latest_reviews` in the
+        context, since the serializer itself cannot query from a coroutine.
+        """
+        reviews = self.context.get("latest_reviews")
+        if reviews is None:
+            reviews = obj.reviews.order_by("-created", "-id")[
+                : self.latest_reviews_limit
+            ]
+        return ReviewSerializer(reviews, many=True, context=self.context).data
+
+    def get_reviews_url(self, obj):
+        """
+        Returns the URL to the paginated list of this book's reviews.
         """
         try:
-            distribution = (
-                Review.objects.filter(book=obj)
-                .values("rating")
-                .annotate(count=models.Count("rating"))
-            )
-            return {item["rating"]: item["count"] for item in distribution}
+            request = self.context.get("request")
+            return reverse("book-reviews", kwargs={"book_id": obj.pk}, request=request)
         except Exception as e:
             logger.error(
-                "Error in calculating rating distribution for book %s: %s",
-                obj.id,
-                str(e),
+                "Error in generating reviews URL for book %s: %s", obj.id, str(e)
             )
-            return {}
+            return None
+
+    def get_stats(self, obj):
+        """
+        Returns the rating statistics of this book.
+
+        Reads the joined BookStats row; if it is missing, computes the same figures
+        with one conditional-aggregation query and caches them on the book.
+        """
+        stats = getattr(obj, "stats", None)
+        if stats is None:
+            logger.warning("Missing statistics row for book %s", obj.id)
+            stats = BookStats(book=obj, **obj.reviews.rating_stats())
+            obj.stats = stats
+        return stats
+
+    def get_rating_distribution(self, obj):
+        """
+        Returns the number of ratings for each of the five star values.
+
+        Keys are strings, as in JSON, so every renderer outputs the same document.
+        """
+        distribution = self.get_stats(obj).rating_distribution
+        return {str(value): count for value, count in distribution.items()}
 
     def get_average_rating(self, obj):
         """
         Returns the average rating for this book.
         """
-        try:
-            return Review.objects.filter(book=obj).aggregate(models.Avg("rating"))[
-                "rating__avg"
-            ]
-        except Exception as e:
-            logger.error(
-                "Error in calculating average rating for book %s: %s", obj.id, str(e)
-            )
-            return None
+        return self.get_stats(obj).average_rating
 
     def get_review_count(self, obj):
         """
         Returns the total number of reviews for this book.
         """
-        try:
-            return obj.reviews.count()
-        except Exception as e:
-            logger.error("Error in counting reviews for book %s: %s", obj.id, str(e))
-            return 0
+        return self.get_stats(obj).review_count
 
     def get_rating_count(self, obj):
         """
-        Returns the total number of ratings for this book.
+        Returns the number of reviews of this book that carry a rating.
         """
-        try:
-            return Review.objects.filter(book=obj).count()
-        except Exception as e:
-            logger.error("Error in counting ratings for book %s: %s", obj.id, str(e))
-            return 0
+        return self.get_stats(obj).rating_count
@@ -0,0 +1,42 @@
+"""
+This module contains the serializer for batch bookmark changes.
+"""
+
+from rest_framework import serializers
+
+
+class BookmarkBatchSerializer(serializers.Serializer):
+    """
+    Validates the desired bookmark states of a batch: the books to bookmark and the
+    books to unbookmark.
+    """
+
+    max_items = 1000
+
+    add = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=max_items,
+        required=False,
+        default=list,
+    )
+    remove = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=max_items,
+        required=False,
+        default=list,
+    )
+
+    def validate(self, attrs):
+        """
+        Deduplicates both lists and rejects books listed in both.
+        """
+        add = list(dict.fromkeys(attrs["add"]))
+        remove = list(dict.fromkeys(attrs["remove"]))
+        both = sorted(set(add) & set(remove))
+        if both:
+            raise serializers.ValidationError(
+                {"remove": [f"Books listed in both add and remove: {both}."]}
+            )
+        if not add and not remove:
+            raise serializers.ValidationError("Nothing to add or remove.")
+        return {"add": add, "remove": remove}
@@ -0,0 +1,48 @@
+"""
+Serializer mixins shared by the warehouse API.
+"""
+
+from rest_framework.exceptions import ValidationError
+
+
+def _split(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def requested_fields(request, available):
+    """
+    Returns the subset of `available` field names selected by the request.
+
+    `?fields=a,b` keeps only the listed fields and `?omit=c` drops fields; both may be
+    combined. Unknown names are rejected with a 400 response.
+    """
+    available = set(available)
+    if request is None:
+        return available
+
+    params = request.query_params
+    fields = _split(params.get("fields", ""))
+    omit = _split(params.get("omit", ""))
+
+    unknown = (fields | omit) - available
+    if unknown:
+        raise ValidationError(
+            {"fields": f"Unknown fields: {', '.join(sorted(unknown))}."}
+        )
+    return (fields or available) - omit
+
+
+class SparseFieldsetMixin:
+    """
+    Drops the fields not selected with `?fields=` / `?omit=` from the serializer.
+
+    Dropped fields are removed before serialization, so their `get_<field>` methods
+    and nested serializers are never evaluated.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        keep = requested_fields(self.context.get("request"), self.fields.keys())
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
@@ -6,6 +6,7 @@ import logging
 
 from rest_framework import serializers
 
+from goodreads.serializers import RowSerializer
 from warehouse.models import Review
 
 
@@ -54,3 +55,61 @@ class ReviewSerializer(serializers.ModelSerializer):
             )
 
         return data
+
+
+class ReviewBatchListSerializer(serializers.ListSerializer):
+    """
+    Validates the items of a batch independently.
+
+    An invalid item does not fail the batch: it is replaced by None in
+    `validated_data` and its errors are kept, by position, in `item_errors`.
+    """
+
+    def to_internal_value(self, data):
+        self.item_errors = []
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        self.child.initial_data = data
+        try:
+            validated = super().run_child_validation(data)
+        except serializers.ValidationError as exc:
+            self.item_errors.append(exc.detail)
+            return None
+        self.item_errors.append({})
+        return validated
+
+
+class ReviewBatchItemSerializer(ReviewSerializer):
+    """
+    Validates one review of a batch submission.
+
+    The book is a plain id, checked for the whole batch with one query by the view,
+    and the user is the requester, so an item needs no query to validate. The unique
+    review validator is dropped because existing reviews are updated.
+    """
+
+    book = serializers.IntegerField(min_value=1)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ["book", "rating", "comment"]
+        validators = []
+        list_serializer_class = ReviewBatchListSerializer
+
+
+class ReviewRowSerializer(RowSerializer):
+    """
+    Read-only counterpart of ReviewSerializer for `values()` rows.
+
+    Rows carry the review columns, with the related ids as `book_id` and `user_id`.
+    The output is identical to ReviewSerializer.
+    """
+
+    field_names = tuple(ReviewSerializer.Meta.fields)
+    field_sources = {"book": "book_id", "user": "user_id"}
+
+    def get_created(self, row):
+        """
+        Returns the creation time in the API's datetime format.
+        """
+        return self.format_datetime(row["created"])
@@ -1,5 +1,13 @@
 """ initializing modules"""
 
+from .asynchronous import (
+    AsyncBookDetailView,
+    AsyncBookListView,
+    AsyncBookReviewListView,
+)
+from .autocomplete import BookAutocompleteAPIView
 from .book import BookDetailAPIView, BookListAPIView
-from .bookmark import BookmarkAPIView
-from .review import SubmitReviewAPIView
+from .bookmark import BookmarkAPIView, BookmarkBatchAPIView
+from .export import BookExportAPIView
+from .review import BookReviewListAPIView, ReviewBatchAPIView, SubmitReviewAPIView
+from .search import BookSearchAPIView
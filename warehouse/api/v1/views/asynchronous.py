@@ -0,0 +1,138 @@
+"""
+Native async versions of the read endpoints for books and reviews.
+
+They return the same payloads as the DRF views they mirror, but run as coroutines
+under ASGI (see `goodreads.views.AsyncAPIView`): queries use Django's async ORM and
+serialization uses the row serializers, which do no I/O. They do not use the payload
+cache or conditional GET of the sync views.
+"""
+
+import logging
+
+from django.http import Http404
+
+from goodreads.pagination import KeysetCursorPagination
+from goodreads.views import AsyncAPIView
+from warehouse.models import Book, Bookmark, BookStats, Review
+
+from ..serializers import (
+    BookDetailSerializer,
+    BookRowSerializer,
+    BookSerializer,
+    ReviewRowSerializer,
+)
+from ..serializers.mixins import requested_fields
+from .book import book_rows
+from .review import filter_reviews
+
+
+logger = logging.getLogger(__name__)
+
+
+def paginated(paginator, results):
+    return {
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+        "results": results,
+    }
+
+
+class AsyncBookListView(AsyncAPIView):
+    """
+    Async counterpart of BookListAPIView.
+
+    - Paginated with the same cursor, newest first, and supports `?fields=` /
+      `?omit=`.
+    - `bookmarked_by_user` is set from one query for the user's bookmarks among the
+      books of the page.
+    """
+
+    pagination_class = KeysetCursorPagination
+
+    async def get(self, request):
+        fields = requested_fields(request, BookSerializer.Meta.fields)
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(
+            book_rows(Book.objects.all(), fields), request, view=self
+        )
+
+        context = {"request": request}
+        if "bookmarked_by_user" in fields:
+            context["bookmarked_book_ids"] = await self.abookmarked_book_ids(
+                request.user, [book["id"] for book in page]
+            )
+        serializer = BookRowSerializer(page, many=True, context=context, fields=fields)
+        return self.respond(paginated(paginator, serializer.data))
+
+    @staticmethod
+    async def abookmarked_book_ids(user, book_ids):
+        """
+        Returns which of `book_ids` the user has bookmarked.
+        """
+        if not user.is_authenticated or not book_ids:
+            return frozenset()
+        bookmarks = Bookmark.objects.filter(user=user, book_id__in=book_ids)
+        return frozenset(
+            [
+                book_id
+                async for book_id in bookmarks.values_list(
+                    "book_id", flat=True
+                ).aiterator()
+            ]
+        )
+
+
+class AsyncBookDetailView(AsyncAPIView):
+    """
+    Async counterpart of BookDetailAPIView.
+
+    The book and its statistics row are read with one query and the latest reviews
+    with a second one, only when requested; the serializer is given the reviews in
+    its context instead of querying them.
+    """
+
+    async def get(self, request, pk):
+        serializer_class = BookDetailSerializer
+        fields = requested_fields(request, serializer_class.Meta.fields)
+        queryset = Book.objects.all()
+        if fields & serializer_class.stats_fields:
+            queryset = queryset.select_related("stats")
+        if "summary" not in fields:
+            queryset = queryset.defer("summary")
+        try:
+            book = await queryset.aget(pk=pk)
+        except Book.DoesNotExist:
+            raise Http404("No Book matches the given query.")
+
+        if fields & serializer_class.stats_fields and not hasattr(book, "stats"):
+            logger.warning("Missing statistics row for book %s", book.id)
+            book.stats = BookStats(book=book, **await book.reviews.arating_stats())
+
+        context = {"request": request}
+        if "reviews" in fields:
+            latest = book.reviews.order_by("-created", "-id")[
+                : serializer_class.latest_reviews_limit
+            ]
+            context["latest_reviews"] = [review async for review in latest.aiterator()]
+        return self.respond(serializer_class(book, context=context).data)
+
+
+class AsyncBookReviewListView(AsyncAPIView):
+    """
+    Async counterpart of BookReviewListAPIView, with the same cursor pagination and
+    `rating` / `has_comment` filters.
+    """
+
+    pagination_class = KeysetCursorPagination
+
+    async def get(self, request, book_id):
+        queryset = filter_reviews(
+            Review.objects.filter(book_id=book_id), request.query_params
+        ).values("id", "book_id", "user_id", "rating", "comment", "created")
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        if not page and not await Book.objects.filter(pk=book_id).aexists():
+            raise Http404("No Book matches the given query.")
+
+        serializer = ReviewRowSerializer(page, many=True, context={"request": request})
+        return self.respond(paginated(paginator, serializer.data))
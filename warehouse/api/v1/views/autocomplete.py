@@ -0,0 +1,53 @@
+"""
+API view for autocompleting book titles.
+"""
+
+import logging
+
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from warehouse.autocomplete import title_index
+
+
+logger = logging.getLogger(__name__)
+
+
+class BookAutocompleteAPIView(APIView):
+    """
+    API view to suggest book titles for a search box.
+
+    - Accessible to authenticated users and read-only for others.
+    - `prefix` is required; every word must start a word of the title.
+    - `limit` bounds the number of suggestions (default 10, at most 50).
+    - Served from the in-process title index without database queries.
+    """
+
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request):
+        """
+        Returns the ids and titles of the best matching books.
+        """
+        prefix = request.query_params.get("prefix", "").strip()
+        if not prefix:
+            raise ValidationError({"prefix": "A prefix is required."})
+
+        try:
+            limit = min(max(int(request.query_params["limit"]), 1), self.max_limit)
+        except (KeyError, ValueError):
+            limit = self.default_limit
+
+        try:
+            matches = title_index.search(prefix, limit=limit)
+        except Exception as e:
+            logger.error("Error in autocompleting %r: %s", prefix, str(e))
+            raise
+
+        return Response(
+            {"results": [{"id": book_id, "title": title} for book_id, title in matches]}
+        )
@@ -6,28 +6,165 @@ specific book.
 """
 
 import logging
+import time
+
+from django.db.models import BooleanField, Count, Max, Value
+from django.db.models.functions import Coalesce
 
 from rest_framework import generics, permissions
+from rest_framework.response import Response
 
-from warehouse.models import Book
+from goodreads.pagination import KeysetCursorPagination
+from goodreads.views import ConditionalGetMixin, StreamingListMixin
+from warehouse.cache import book_detail_cache, book_list_cache, user_bookmarks_cache
+from warehouse.models import Book, Bookmark
 
-from ..serializers import BookDetailSerializer, BookSerializer
+from ..serializers import BookDetailSerializer, BookRowSerializer, BookSerializer
+from ..serializers.mixins import requested_fields
 
 
 logger = logging.getLogger(__name__)
 
 
-class BookListAPIView(generics.ListAPIView):
+def book_rows(queryset, fields):
+    """
+    Returns `values()` rows of the books with the listed columns and the requested
+    computed fields: `bookmark_count` and a public `bookmarked_by_user`.
+    """
+    annotations = {}
+    if "bookmark_count" in fields:
+        annotations["bookmark_count"] = Coalesce("stats__bookmark_count", 0)
+    if "bookmarked_by_user" in fields:
+        annotations["bookmarked_by_user"] = Value(False, output_field=BooleanField())
+    return queryset.values("id", "title", "created", **annotations)
+
+
+class BookListAPIView(ConditionalGetMixin, StreamingListMixin, generics.ListAPIView):
     """
     API view to list all books.
 
     - Accessible to authenticated users and read-only for others.
-    - Uses BookSerializer to serialize book data.
+    - Reads `values()` rows and serializes them with BookRowSerializer, which
+      produces the same output as BookSerializer without building model instances.
+    - Bookmark count is read from the book's statistics row in the same query, so
+      the number of queries does not grow with the number of books.
+    - Paginated with an opaque cursor over `(created, id)`, newest first.
+    - Pages are cached once for all users with `bookmarked_by_user` set to false;
+      the flag is then filled in from the user's cached set of bookmarked book ids.
+      Bookmarks only invalidate that set, so `bookmark_count` on a cached page may
+      lag by up to `BOOK_LIST_CACHE_TIMEOUT` seconds.
+    - `?fields=` / `?omit=` select the returned fields; the statistics join and the
+      bookmark overlay are skipped when their fields are not requested.
+    - Supports conditional GET: the ETag is derived from the cached page and the
+      version of the user's bookmarks, so validating a request runs no query.
+    - Streams every book, unpaginated and uncached, as NDJSON or a JSON array when
+      the Accept header asks for it (see `StreamingListMixin`).
     """
 
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetCursorPagination
+    conditional_vary_headers = ("Cookie", "Authorization")
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Returns the list's validators, read from the cache without a query: when the
+        public page was built and the version of the user's bookmarks.
+
+        The page is rebuilt whenever a book is saved or deleted (or its cache entry
+        expires), so the ETag changes with it. No Last-Modified is sent: the build
+        time is not when the content last changed.
+        """
+        if self.is_streaming():
+            return None, None
+        page, _ = self.get_cached_page()
+        bookmarks = None
+        if request.user.is_authenticated and "bookmarked_by_user" in self.get_fields():
+            bookmarks = user_bookmarks_cache.version(request.user.pk)
+        return (request.user.pk, page["built"], bookmarks), None
+
+    def get_fields(self):
+        return requested_fields(self.request, self.serializer_class.Meta.fields)
+
+    def get_queryset(self):
+        """
+        Returns `values()` rows with the listed columns and the requested computed
+        fields: `bookmark_count` and a public `bookmarked_by_user`.
+        """
+        return book_rows(super().get_queryset(), self.get_fields())
+
+    def get_public_page(self):
+        """
+        Returns the user independent payload of the requested page and the ids of
+        its books.
+        """
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        serializer = BookRowSerializer(
+            page,
+            many=True,
+            context=self.get_serializer_context(),
+            fields=self.get_fields(),
+        )
+        return {
+            "payload": self.get_paginated_response(serializer.data).data,
+            "ids": [book["id"] for book in page],
+            "built": time.time_ns(),
+        }
+
+    def get_cached_page(self):
+        """
+        Returns the cached public page and whether it was a cache hit, reading the
+        cache once per request.
+        """
+        if not hasattr(self, "_cached_page"):
+            self._cached_page = book_list_cache.get_or_set(
+                "all", self.get_public_page, variant=self.request.build_absolute_uri()
+            )
+        return self._cached_page
+
+    def get_stream_serializer(self):
+        """
+        Returns a row serializer that sets `bookmarked_by_user` from the user's
+        bookmarks directly.
+        """
+        context = self.get_serializer_context()
+        if "bookmarked_by_user" in self.get_fields():
+            context["bookmarked_book_ids"] = self.get_bookmarked_book_ids()
+        return BookRowSerializer(context=context, fields=self.get_fields())
+
+    def get_bookmarked_book_ids(self):
+        """
+        Returns the ids of the books bookmarked by the current user.
+        """
+        user = self.request.user
+        if not user.is_authenticated:
+            return frozenset()
+        book_ids, _ = user_bookmarks_cache.get_or_set(
+            user.pk,
+            lambda: frozenset(
+                Bookmark.objects.filter(user=user).values_list("book_id", flat=True)
+            ),
+        )
+        return book_ids
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns the cached public page with the user's bookmark flags merged in.
+        """
+        page, hit = self.get_cached_page()
+        data = page["payload"]
+        if "bookmarked_by_user" in self.get_fields():
+            book_ids = self.get_bookmarked_book_ids()
+            if book_ids:
+                data = {
+                    **data,
+                    "results": [
+                        {**book, "bookmarked_by_user": book_id in book_ids}
+                        for book_id, book in zip(page["ids"], data["results"])
+                    ],
+                }
+        return Response(data, headers={"X-Cache": "HIT" if hit else "MISS"})
 
     def get(self, request, *args, **kwargs):
         try:
@@ -37,18 +174,73 @@ class BookListAPIView(generics.ListAPIView):
             raise
 
 
-class BookDetailAPIView(generics.RetrieveAPIView):
+class BookDetailAPIView(ConditionalGetMixin, generics.RetrieveAPIView):
     """
     API view to retrieve detailed information about a specific book.
 
     - Accessible to authenticated users and read-only for others.
     - Uses BookDetailSerializer to serialize detailed book data.
+    - Rating statistics are read from the book's statistics row, joined in the same
+      query as the book.
+    - The serialized body is cached per book version; writes to the book or its
+      reviews bump the version (see `warehouse.signals`).
+    - Supports conditional GET: the ETag is derived from the book's `modified`
+      timestamp and the latest change and count of its reviews. No Last-Modified is
+      sent, since deleting a review does not advance any timestamp.
+    - `?fields=` / `?omit=` select the returned fields; the statistics join, the
+      reviews query and the summary column are skipped when not requested.
     """
 
     queryset = Book.objects.all()
     serializer_class = BookDetailSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def get_fields(self):
+        return requested_fields(self.request, self.serializer_class.Meta.fields)
+
+    def get_queryset(self):
+        """
+        Joins the statistics row and loads the summary only when they are requested.
+        """
+        fields = self.get_fields()
+        queryset = super().get_queryset()
+        if fields & self.serializer_class.stats_fields:
+            queryset = queryset.select_related("stats")
+        if "summary" not in fields:
+            queryset = queryset.defer("summary")
+        return queryset
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Returns the book's ETag state, or none if the book does not exist.
+        """
+        row = (
+            Book.objects.filter(pk=kwargs["pk"])
+            .annotate(
+                reviews_modified=Max("reviews__modified"),
+                review_count=Count("reviews"),
+            )
+            .values("modified", "reviews_modified", "review_count")
+            .order_by("pk")
+            .first()
+        )
+        if row is None:
+            return None, None
+        state = (row["modified"], row["reviews_modified"], row["review_count"])
+        return state, None
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Returns the cached book payload, serializing it only on a cache miss.
+        """
+        data, hit = book_detail_cache.get_or_set(
+            kwargs["pk"],
+            lambda: self.get_serializer(self.get_object()).data,
+            variant=request.build_absolute_uri("/")
+            + ",".join(sorted(self.get_fields())),
+        )
+        return Response(data, headers={"X-Cache": "HIT" if hit else "MISS"})
+
     def get(self, request, *args, **kwargs):
         try:
             return super().get(request, *args, **kwargs)
@@ -4,14 +4,18 @@ This module defines the API for managing bookmarks on books.
 
 import logging
 
-from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from warehouse.cache import user_bookmarks_cache
 from warehouse.models import Book, Bookmark, Review
 
+from ..serializers import BookmarkBatchSerializer
+
 
 logger = logging.getLogger(__name__)
 
@@ -30,38 +34,56 @@ class BookmarkAPIView(APIView):
         - If the user has bookmarked the book, the bookmark is removed.
         - If the user has reviewed/rated the book, bookmarking is blocked.
         - If the book isn't bookmarked and not reviewed, a new bookmark is created.
+        - If a concurrent request created the bookmark first, nothing changes and
+          200 "Book already bookmarked" is returned.
+        - The book's bookmark counter is updated in the same transaction.
+
+        The toggle is one atomic delete-then-insert (see `BookmarkManager.toggle`),
+        so concurrent requests cannot fail on the unique constraint.
 
         Returns a message indicating the action performed.
         """
         try:
-            book = get_object_or_404(Book, id=book_id)
-
-            bookmark = Bookmark.objects.filter(user=request.user, book=book).first()
+            outcome = Bookmark.objects.toggle(request.user, book_id)
+            if outcome in {"removed", "created"}:
+                user_bookmarks_cache.bump_on_commit(request.user.id)
 
-            if bookmark:
-                bookmark.delete()
+            if outcome == "removed":
                 logger.info(
-                    "Bookmark removed for user %s on book %s", request.user.id, book.id
+                    "Bookmark removed for user %s on book %s",
+                    request.user.id,
+                    book_id,
                 )
                 return Response(
                     {"message": "Bookmark removed"},
                     status=status.HTTP_204_NO_CONTENT,
                 )
 
-            if Review.objects.filter(user=request.user, book=book).exists():
+            if outcome == "not_found":
+                return Response(
+                    {"error": "Book not found."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            if outcome == "reviewed":
                 logger.warning(
                     "User %s attempted to bookmark a reviewed/rated book %s",
                     request.user.id,
-                    book.id,
+                    book_id,
                 )
                 return Response(
                     {"error": "Cannot bookmark a book you have reviewed or rated"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            Bookmark.objects.create(user=request.user, book=book)
+            if outcome == "bookmarked":
+                return Response(
+                    {"message": "Book already bookmarked"},
+                    status=status.HTTP_200_OK,
+                )
+
             logger.info(
-                "Bookmark created for user %s on book %s", request.user.id, book.id
+                "Bookmark created for user %s on book %s", request.user.id, book_id
             )
             return Response(
                 {"message": "Book bookmarked"},
@@ -79,3 +101,92 @@ class BookmarkAPIView(APIView):
                 {"error": "An error occurred during the bookmarking process."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class BookmarkBatchAPIView(APIView):
+    """
+    Sets the desired bookmark state of many books in one request.
+
+    - Accepts `{"add": [book ids], "remove": [book ids]}`; adding a bookmarked book
+      or removing one that is not bookmarked is a no-op, so a client can replay the
+      same batch safely.
+    - Which books exist and which the user has reviewed is read with one query.
+    - Bookmarks are inserted with one `bulk_create(ignore_conflicts=True)` and
+      removed with one filtered delete, in one transaction.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        """
+        Apply a batch of bookmark changes.
+
+        Returns:
+        - 200 OK with the `bookmarked` and `unbookmarked` book ids, the number of
+          bookmarks actually `removed`, and the `rejected` books with the reason.
+        - 400 Bad Request if the body is invalid or a book is in both lists.
+        - 500 Internal Server Error if an exception occurs.
+        """
+        serializer = BookmarkBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            user = request.user
+            add = serializer.validated_data["add"]
+            remove = serializer.validated_data["remove"]
+
+            reviewed = dict(
+                Book.objects.filter(id__in=add)
+                .annotate(
+                    reviewed=Exists(
+                        Review.objects.filter(user=user, book=OuterRef("pk"))
+                    )
+                )
+                .values_list("id", "reviewed")
+            )
+            allowed = [book_id for book_id in add if reviewed.get(book_id) is False]
+            rejected = [
+                {
+                    "book": book_id,
+                    "error": (
+                        "Book not found."
+                        if book_id not in reviewed
+                        else "Cannot bookmark a book you have reviewed or rated."
+                    ),
+                }
+                for book_id in add
+                if reviewed.get(book_id) is not False
+            ]
+
+            removed = 0
+            if allowed or remove:
+                with transaction.atomic():
+                    removed = Bookmark.objects.apply_for_user(user, allowed, remove)
+                    user_bookmarks_cache.bump_on_commit(user.id)
+
+            logger.info(
+                "Bookmark batch for user %s: %s bookmarked, %s removed, %s rejected",
+                user.id,
+                len(allowed),
+                removed,
+                len(rejected),
+            )
+            return Response(
+                {
+                    "bookmarked": allowed,
+                    "unbookmarked": remove,
+                    "removed": removed,
+                    "rejected": rejected,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        except Exception as e:
+            logger.error(
+                "Error in batch bookmarking for user %s: %s", request.user.id, str(e)
+            )
+            return Response(
+                {"error": "An error occurred during the batch bookmarking process."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
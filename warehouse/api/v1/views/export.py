@@ -0,0 +1,77 @@
+"""
+API view for exporting the whole book catalog.
+"""
+
+import logging
+
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+
+from rest_framework import permissions
+from rest_framework.views import APIView
+
+from goodreads.renderers import CSVRenderer, NDJSONRenderer
+from warehouse.export import BookExport
+
+
+logger = logging.getLogger(__name__)
+
+
+def accepts_gzip(header):
+    """
+    Returns whether an `Accept-Encoding` header value allows gzip.
+
+    The `gzip` (or `x-gzip`) entry decides when present, otherwise `*` does; an
+    entry with `q=0` or an invalid q-value refuses the coding.
+    """
+    qvalues = {}
+    for entry in header.split(","):
+        coding, *params = (part.strip() for part in entry.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qvalues[coding.lower()] = quality
+
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qvalues:
+            return qvalues[coding] > 0
+    return False
+
+
+class BookExportAPIView(APIView):
+    """
+    API view to stream every book with its statistics.
+
+    - Accessible to staff users only.
+    - NDJSON by default; CSV with `Accept: text/csv` or `?format=csv`.
+    - Compressed with gzip on the fly when the client's `Accept-Encoding` allows
+      gzip with a non-zero q-value.
+    - See `warehouse.export` for the row layout and how rows are read.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    def get(self, request):
+        try:
+            renderer = request.accepted_renderer
+            compress = accepts_gzip(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+            export = BookExport(export_format=renderer.format, compress=compress)
+
+            response = StreamingHttpResponse(export, content_type=export.content_type)
+            response.headers["Content-Disposition"] = (
+                f'attachment; filename="books.{renderer.format}"'
+            )
+            if compress:
+                response.headers["Content-Encoding"] = "gzip"
+            patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+            logger.info("Book export started by user %s", request.user.id)
+            return response
+        except Exception as e:
+            logger.error("Error in exporting books: %s", str(e))
+            raise
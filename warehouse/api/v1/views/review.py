@@ -1,23 +1,114 @@
 """
-API views for submitting and updating reviews on books.
+API views for listing, submitting and updating reviews on books.
 """
 
 import logging
 
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 
-from rest_framework import permissions, status
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from goodreads.pagination import KeysetCursorPagination
+from goodreads.views import StreamingListMixin
+from warehouse import search
+from warehouse.cache import book_detail_cache
 from warehouse.models import Book, Review
 
-from ..serializers import ReviewSerializer
+from ..serializers import (
+    ReviewBatchItemSerializer,
+    ReviewRowSerializer,
+    ReviewSerializer,
+)
 
 
 logger = logging.getLogger(__name__)
 
 
+def filter_reviews(queryset, params):
+    """
+    Narrows a review queryset by the optional `rating` and `has_comment` query
+    parameters.
+    """
+    rating = params.get("rating")
+    if rating is not None:
+        if rating not in {"1", "2", "3", "4", "5"}:
+            raise ValidationError({"rating": "Rating must be between 1 and 5."})
+        queryset = queryset.filter(rating=int(rating))
+
+    has_comment = params.get("has_comment")
+    if has_comment is not None:
+        if has_comment.lower() not in {"true", "false", "1", "0"}:
+            raise ValidationError({"has_comment": "Must be true or false."})
+        with_comment = Q(comment__isnull=False) & ~Q(comment="")
+        if has_comment.lower() in {"true", "1"}:
+            queryset = queryset.filter(with_comment)
+        else:
+            queryset = queryset.exclude(with_comment)
+
+    return queryset
+
+
+class BookReviewListAPIView(StreamingListMixin, generics.ListAPIView):
+    """
+    API view to list the reviews of a book.
+
+    - Accessible to authenticated users and read-only for others.
+    - Paginated with an opaque cursor over `(created, id)`, newest first, backed by
+      the `(book, created, id)` index.
+    - Optional filters: `rating` (1 to 5) and `has_comment` (true or false).
+    - Reads `values()` rows and serializes them with ReviewRowSerializer, which
+      produces the same output as ReviewSerializer without building model instances.
+    - Streams all matching reviews, unpaginated, as NDJSON or a JSON array when the
+      Accept header asks for it (see `StreamingListMixin`).
+    """
+
+    serializer_class = ReviewSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetCursorPagination
+
+    def get_queryset(self):
+        """
+        Returns the book's reviews narrowed by the optional query filters.
+        """
+        return filter_reviews(
+            Review.objects.filter(book_id=self.kwargs["book_id"]),
+            self.request.query_params,
+        ).values("id", "book_id", "user_id", "rating", "comment", "created")
+
+    def get_stream_serializer(self):
+        return ReviewRowSerializer(context=self.get_serializer_context())
+
+    def stream(self, request, *args, **kwargs):
+        get_object_or_404(Book.objects.only("id"), pk=self.kwargs["book_id"])
+        return super().stream(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        if not page and not Book.objects.filter(pk=self.kwargs["book_id"]).exists():
+            raise Http404("No Book matches the given query.")
+        serializer = ReviewRowSerializer(
+            page, many=True, context=self.get_serializer_context()
+        )
+        return self.get_paginated_response(serializer.data)
+
+    def get(self, request, *args, **kwargs):
+        try:
+            return super().get(request, *args, **kwargs)
+        except Exception as e:
+            logger.error(
+                "Error in listing reviews for book %s: %s",
+                kwargs.get("book_id"),
+                str(e),
+            )
+            raise
+
+
 class SubmitReviewAPIView(APIView):
     """
     Handles the creation and updating of book reviews.
@@ -33,59 +124,58 @@ class SubmitReviewAPIView(APIView):
         - If the review exists, updates both rating and comment.
         - If the review doesn't exist, creates a new one.
 
+        The review is saved with one upsert statement (see `ReviewQuerySet.upsert`);
+        the book is not fetched first.
+
         Logs the creation or update action.
 
         Returns:
         - 201 Created if a new review is created.
         - 200 OK if an existing review is updated.
         - 400 Bad Request if validation fails.
+        - 404 Not Found if the book does not exist.
         - 500 Internal Server Error if an exception occurs.
         """
         try:
-            book = get_object_or_404(Book, id=book_id)
             data = request.data.copy()
-            data["book"] = book.id
-            data["user"] = request.user.id
-
-            serializer = ReviewSerializer(data=data)
+            data["book"] = book_id
+            serializer = ReviewBatchItemSerializer(data=data)
 
-            if serializer.is_valid():
-                review, created = Review.objects.update_or_create(
-                    user=request.user,
-                    book=book,
-                    defaults={
-                        "rating": serializer.validated_data.get("rating"),
-                        "comment": serializer.validated_data.get("comment"),
-                    },
+            if not serializer.is_valid():
+                logger.warning(
+                    "Validation failed for review by user %s on book %s",
+                    request.user.id,
+                    book_id,
+                )
+                return Response(
+                    serializer.errors,
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
 
-                if created:
-                    logger.info(
-                        "Review created for user %s on book %s",
-                        request.user.id,
-                        book.id,
-                    )
+            with transaction.atomic():
+                review, created = Review.objects.upsert(
+                    request.user,
+                    book_id,
+                    serializer.validated_data.get("rating"),
+                    serializer.validated_data.get("comment"),
+                )
+                if review is None:
                     return Response(
-                        serializer.data,
-                        status=status.HTTP_201_CREATED,
+                        {"error": "Book not found."},
+                        status=status.HTTP_404_NOT_FOUND,
                     )
+                search.index_review(review)
+                book_detail_cache.bump_on_commit(book_id)
 
-                logger.info(
-                    "Review updated for user %s on book %s", request.user.id, book.id
-                )
-                return Response(
-                    serializer.data,
-                    status=status.HTTP_200_OK,
-                )
-
-            logger.warning(
-                "Validation failed for review by user %s on book %s",
+            logger.info(
+                "Review %s for user %s on book %s",
+                "created" if created else "updated",
                 request.user.id,
-                book.id,
+                book_id,
             )
             return Response(
-                serializer.errors,
-                status=status.HTTP_400_BAD_REQUEST,
+                ReviewSerializer(review).data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
             )
 
         except Exception as e:
@@ -120,7 +210,8 @@ class SubmitReviewAPIView(APIView):
             serializer = ReviewSerializer(review, data=request.data, partial=True)
 
             if serializer.is_valid():
-                serializer.save()
+                with transaction.atomic():
+                    serializer.save()
                 logger.info(
                     "Review partially updated for user %s on book %s",
                     request.user.id,
@@ -150,3 +241,109 @@ class SubmitReviewAPIView(APIView):
                 {"error": "An error occurred during the review update process."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class ReviewBatchAPIView(APIView):
+    """
+    Creates or updates many of the user's reviews in one request.
+
+    - Accepts a list of up to `max_items` `{book, rating, comment}` objects.
+    - Items are validated independently; all referenced books are looked up with one
+      query and the valid items are saved with one bulk upsert.
+    - Responds with the outcome of each item, in the order they were sent.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    max_items = 500
+
+    def post(self, request):
+        """
+        Create or update a batch of reviews.
+
+        Returns:
+        - 200 OK with `created`, `updated` and `failed` counts and a `results` list
+          holding `{book, status, review}` or `{book, status, errors}` per item.
+        - 400 Bad Request if the body is not a list or has too many items.
+        - 500 Internal Server Error if an exception occurs.
+        """
+        serializer = ReviewBatchItemSerializer(
+            data=request.data, many=True, max_length=self.max_items
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            items = serializer.validated_data
+            requested = {item["book"] for item in items if item is not None}
+            existing = set(
+                Book.objects.filter(id__in=requested).values_list("id", flat=True)
+            )
+
+            errors, entries = {}, {}
+            for index, (item, item_errors) in enumerate(
+                zip(items, serializer.item_errors)
+            ):
+                if item_errors:
+                    errors[index] = item_errors
+                elif item["book"] not in existing:
+                    errors[index] = {"book": ["Book not found."]}
+                elif item["book"] in entries:
+                    errors[index] = {"book": ["Duplicate book in this batch."]}
+                else:
+                    entries[item["book"]] = (item.get("rating"), item.get("comment"))
+
+            reviews, created = {}, set()
+            if entries:
+                with transaction.atomic():
+                    saved, created = Review.objects.upsert_for_user(
+                        request.user, entries
+                    )
+                    search.index_reviews(saved)
+                    book_ids = list(entries)
+                    transaction.on_commit(lambda: book_detail_cache.bump_many(book_ids))
+                reviews = {review.book_id: review for review in saved}
+
+            results = []
+            for index, data in enumerate(request.data):
+                if index in errors:
+                    book = data.get("book") if isinstance(data, dict) else None
+                    results.append(
+                        {"book": book, "status": "error", "errors": errors[index]}
+                    )
+                    continue
+                review = reviews[items[index]["book"]]
+                results.append(
+                    {
+                        "book": review.book_id,
+                        "status": "created" if review.book_id in created else "updated",
+                        "review": ReviewSerializer(review).data,
+                    }
+                )
+
+            logger.info(
+                "Review batch for user %s: %s created, %s updated, %s failed",
+                request.user.id,
+                len(created),
+                len(entries) - len(created),
+                len(errors),
+            )
+            return Response(
+                {
+                    "created": len(created),
+                    "updated": len(entries) - len(created),
+                    "failed": len(errors),
+                    "results": results,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        except Exception as e:
+            logger.error(
+                "Error in batch review submission for user %s: %s",
+                request.user.id,
+                str(e),
+            )
+            return Response(
+                {"error": "An error occurred during the batch review process."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -0,0 +1,81 @@
+"""
+API view for full-text search over books.
+"""
+
+import logging
+
+from django.db.models import BooleanField, Exists, OuterRef, Value
+from django.db.models.functions import Coalesce
+
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from warehouse import search
+from warehouse.models import Book, Bookmark
+
+from ..serializers import BookSerializer
+
+
+logger = logging.getLogger(__name__)
+
+
+class BookSearchAPIView(generics.GenericAPIView):
+    """
+    API view to search books by title, summary and optionally review comments.
+
+    - Accessible to authenticated users and read-only for others.
+    - `q` is required; every word must match, the last one as a prefix.
+    - `include_reviews=true` also matches books through their review comments.
+    - `limit` bounds the number of results (default 20, at most 100).
+    - Results are ranked by BM25 relevance, best match first.
+    """
+
+    serializer_class = BookSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    default_limit = 20
+    max_limit = 100
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params["limit"])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def get(self, request, *args, **kwargs):
+        """
+        Returns the books matching `q` in relevance order.
+        """
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": "A search query is required."})
+        include_reviews = request.query_params.get("include_reviews", "").lower() in {
+            "true",
+            "1",
+        }
+
+        try:
+            book_ids = search.search_book_ids(
+                text, limit=self.get_limit(), include_reviews=include_reviews
+            )
+        except Exception as e:
+            logger.error("Error in searching books for %r: %s", text, str(e))
+            raise
+
+        user = request.user
+        if user.is_authenticated:
+            bookmarked_by_user = Exists(
+                Bookmark.objects.filter(book=OuterRef("pk"), user=user)
+            )
+        else:
+            bookmarked_by_user = Value(False, output_field=BooleanField())
+        books = Book.objects.filter(id__in=book_ids).annotate(
+            bookmark_count=Coalesce("stats__bookmark_count", 0),
+            bookmarked_by_user=bookmarked_by_user,
+        )
+        by_id = {book.id: book for book in books}
+        ranked = [by_id[book_id] for book_id in book_ids if book_id in by_id]
+
+        serializer = self.get_serializer(ranked, many=True)
+        return Response({"results": serializer.data})
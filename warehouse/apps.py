@@ -3,6 +3,7 @@ App configuration for the warehouse app.
 """
 
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class WarehouseConfig(AppConfig):
@@ -12,3 +13,11 @@ class WarehouseConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "warehouse"
+
+    def ready(self):
+        """
+        Connects the signal handlers that maintain derived book data.
+        """
+        from . import signals
+
+        post_migrate.connect(signals.create_search_tables, sender=self)
@@ -0,0 +1,319 @@
+"""
+In-process prefix index of book titles for autocomplete.
+
+Titles are split into normalized tokens (case-folded, accents removed) and kept as a
+sorted array of `(token, book_id)` pairs, so the books matching a prefix are one
+binary search away. Short prefixes match a large share of the titles, so for every
+prefix of up to `TOP_PREFIX_LENGTH` characters the best `TOP_SIZE` books are kept
+ranked in advance and a lookup reads that list instead of scanning the range.
+
+The index is loaded in a background thread on the first search, so starting the app
+or running a management command does not query the database, and is then updated
+incrementally by the Book signal handlers in `warehouse.signals`, which only see the
+changes made by this process. To pick up the books changed by other processes
+(other workers, `import_books`), a search at most every `CHANGE_CHECK_INTERVAL`
+seconds makes the background thread compare the number of books and their latest
+`modified` time with those of the last load, and reload the index if they differ.
+Writers replace the arrays instead of changing them in place, so searches read a
+consistent snapshot without taking the lock.
+"""
+
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import groupby
+
+from django.db import DatabaseError, connection
+from django.db.models import Count, Max
+
+from .models import Book
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Prefixes up to this length keep a ranked list of their best matches.
+TOP_PREFIX_LENGTH = 3
+
+# Length of those lists; the autocomplete view returns at most this many titles.
+TOP_SIZE = 50
+
+# Seconds between checks of the books table for changes by other processes.
+CHANGE_CHECK_INTERVAL = 5
+
+
+def normalize(text):
+    """
+    Returns `text` case-folded and without diacritics.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """
+    Returns the distinct normalized tokens of `text`.
+    """
+    return set(TOKEN_RE.findall(normalize(text)))
+
+
+def short_prefixes(tokens):
+    """
+    Returns the prefixes of `tokens` that have a ranked list.
+    """
+    return {
+        token[:length]
+        for token in tokens
+        for length in range(1, min(len(token), TOP_PREFIX_LENGTH) + 1)
+    }
+
+
+class TitleIndex:
+    """
+    Sorted-array prefix index over the tokens of every book title.
+    """
+
+    def __init__(self, load_wait=1.0):
+        # Seconds a search waits for the initial load before answering empty.
+        self.load_wait = load_wait
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._loading = False
+        # None, "check" (reload if the books changed) or "load".
+        self._reload = None
+        self._pending = []
+        self._entries = []
+        self._titles = {}
+        self._top = {}
+        self._state = None
+        self._checked_at = 0.0
+
+    def load(self):
+        """
+        (Re)builds the index from the books table.
+        """
+        # Read first, so a change made during the load triggers another one.
+        state = self._books_state()
+        titles = {
+            book_id: (title, normalize(title))
+            for book_id, title in Book.objects.values_list("id", "title").iterator()
+        }
+        entries = sorted(
+            (token, book_id)
+            for book_id, (_, normalized) in titles.items()
+            for token in set(TOKEN_RE.findall(normalized))
+        )
+        top = {}
+        for length in range(1, TOP_PREFIX_LENGTH + 1):
+            long_enough = (entry for entry in entries if len(entry[0]) >= length)
+            for prefix, group in groupby(long_enough, key=lambda e: e[0][:length]):
+                top[prefix] = self._rank(
+                    prefix, {book_id for _, book_id in group}, titles
+                )
+
+        with self._lock:
+            self._titles, self._entries, self._top = titles, entries, top
+            self._state = state
+            pending, self._pending = self._pending, []
+            for change in pending:
+                self._apply(*change)
+            self._ready.set()
+        logger.info("Loaded autocomplete index with %s titles", len(titles))
+
+    def start_loading(self, check=False):
+        """
+        Loads the index in a background thread. A call made while a load is running
+        makes that thread load again once it finishes, so it sees the latest data.
+
+        With `check`, the thread only reloads if the books changed since the last
+        load.
+        """
+        with self._lock:
+            if not check or self._reload is None:
+                self._reload = "check" if check else "load"
+            if self._loading:
+                return
+            self._loading = True
+        threading.Thread(target=self._load_in_background, daemon=True).start()
+
+    def _load_in_background(self):
+        try:
+            while True:
+                with self._lock:
+                    reload, self._reload = self._reload, None
+                    if reload is None:
+                        self._loading = False
+                        return
+                try:
+                    if reload == "check" and self._books_state() == self._state:
+                        continue
+                    self.load()
+                except DatabaseError as e:
+                    # Typically the tables do not exist yet.
+                    logger.warning("Autocomplete index not loaded: %s", str(e))
+                except Exception as e:
+                    logger.error("Error in loading the autocomplete index: %s", str(e))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _books_state():
+        """
+        Returns the number of books and their latest `modified` time, which change
+        whenever a book is created, updated or deleted.
+        """
+        state = Book.objects.aggregate(count=Count("id"), modified=Max("modified"))
+        return state["count"], state["modified"]
+
+    def add(self, book_id, title):
+        """
+        Adds a book, replacing its previous title if it was indexed.
+        """
+        with self._lock:
+            self._apply("add", book_id, title)
+
+    def remove(self, book_id):
+        """
+        Removes a book from the index.
+        """
+        with self._lock:
+            self._apply("remove", book_id)
+
+    def _apply(self, action, book_id, title=None):
+        """
+        Applies a change; changes made before the first load are replayed after it.
+        Must be called with the lock held.
+        """
+        if not self._ready.is_set() and not self._loading:
+            return
+        if not self._ready.is_set():
+            self._pending.append((action, book_id, title))
+            return
+
+        titles = self._titles
+        entries = list(self._entries)
+        top = dict(self._top)
+
+        indexed = titles.pop(book_id, None)
+        removed = tokenize(indexed[0]) if indexed is not None else set()
+        for token in removed:
+            position = bisect_left(entries, (token, book_id))
+            if position < len(entries) and entries[position] == (token, book_id):
+                del entries[position]
+
+        added = set()
+        if action == "add":
+            titles[book_id] = (title, normalize(title))
+            added = tokenize(title)
+            for token in added:
+                insort(entries, (token, book_id))
+
+        # A list shorter than TOP_SIZE holds every match of its prefix, so only a
+        # book leaving a full list requires reading the whole range.
+        for prefix in short_prefixes(removed | added):
+            ranked = top.get(prefix, [])
+            if book_id in ranked and len(ranked) == TOP_SIZE:
+                start, end = self._prefix_range(entries, prefix)
+                candidates = {other for _, other in entries[start:end]}
+            else:
+                candidates = {other for other in ranked if other != book_id}
+                if book_id in titles and prefix in short_prefixes(added):
+                    candidates.add(book_id)
+            top[prefix] = self._rank(prefix, candidates, titles)
+            if not top[prefix]:
+                del top[prefix]
+
+        self._entries, self._top = entries, top
+
+    def _check_for_changes(self):
+        """
+        Makes the background thread check for books changed by other processes,
+        at most every `CHANGE_CHECK_INTERVAL` seconds.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < CHANGE_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        self.start_loading(check=True)
+
+    @staticmethod
+    def _rank(prefix, book_ids, titles):
+        """
+        Returns the best `TOP_SIZE` of `book_ids` for a query equal to `prefix`.
+        """
+
+        def rank(book_id):
+            title, normalized = titles[book_id]
+            return (not normalized.startswith(prefix), len(title), title, book_id)
+
+        return heapq.nsmallest(TOP_SIZE, book_ids, key=rank)
+
+    @staticmethod
+    def _prefix_range(entries, prefix):
+        start = bisect_left(entries, (prefix,))
+        end = bisect_left(entries, (prefix + "\U0010ffff",), start)
+        return start, end
+
+    def search(self, text, limit=10):
+        """
+        Returns up to `limit` `(book_id, title)` pairs whose titles contain a token
+        starting with each word of `text`.
+
+        Titles starting with the whole query come first, then shorter titles, then
+        titles in alphabetical order. A single short word is answered from its ranked
+        list. Otherwise candidates come from the word with the fewest matching
+        tokens and the other words are checked against each candidate's title.
+        """
+        terms = tokenize(text)
+        if not terms:
+            return []
+
+        if not self._ready.is_set():
+            self.start_loading()
+            if not self._ready.wait(self.load_wait):
+                return []
+        self._check_for_changes()
+
+        entries, titles, top = self._entries, self._titles, self._top
+        ranges = {term: self._prefix_range(entries, term) for term in terms}
+        narrowest = min(terms, key=lambda term: ranges[term][1] - ranges[term][0])
+        others = terms - {narrowest}
+        if not others and len(narrowest) <= TOP_PREFIX_LENGTH:
+            return [
+                (book_id, titles[book_id][0])
+                for book_id in top.get(narrowest, ())[:limit]
+                if book_id in titles
+            ]
+
+        # The ranked lists are cut at TOP_SIZE, so the other words may only match
+        # books outside them; read the whole range instead.
+        start, end = ranges[narrowest]
+        candidates = dict.fromkeys(book_id for _, book_id in entries[start:end])
+
+        matches = {}
+        for book_id in candidates:
+            indexed = titles.get(book_id)
+            if indexed is None:
+                continue
+            tokens = TOKEN_RE.findall(indexed[1])
+            if all(any(token.startswith(term) for token in tokens) for term in others):
+                matches[book_id] = indexed
+
+        query = normalize(text).strip()
+
+        def rank(book_id):
+            title, normalized = matches[book_id]
+            return (not normalized.startswith(query), len(title), title)
+
+        return [
+            (book_id, matches[book_id][0])
+            for book_id in heapq.nsmallest(limit, matches, key=rank)
+        ]
+
+
+title_index = TitleIndex()
@@ -0,0 +1,151 @@
+"""
+Versioned caching of serialized API payloads.
+
+Each cached object (for example a book) has a version number stored in the cache
+backend. Payloads are cached under a key that includes the current version, so
+writers invalidate every cached variant of an object by bumping its version instead
+of tracking and deleting individual keys. The backend is whichever Django cache alias
+is configured, so a local-memory cache works for single-host deployments and a shared
+cache (Redis, Memcached) for several hosts.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from goodreads.db import router
+
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedCache:
+    """
+    Caches payloads per object and version, and counts hits and misses.
+    """
+
+    def __init__(self, namespace, alias=None, timeout=None):
+        self.namespace = namespace
+        self.alias = alias
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        return caches[
+            self.alias or getattr(settings, "WAREHOUSE_CACHE_ALIAS", "default")
+        ]
+
+    def _version_key(self, object_id):
+        return f"{self.namespace}:version:{object_id}"
+
+    def version(self, object_id):
+        """
+        Returns the current version of an object.
+
+        A missing version (new object or evicted key) starts from the current time in
+        nanoseconds, so it can never collide with a version used before.
+        """
+        key = self._version_key(object_id)
+        version = self.backend.get(key)
+        if version is None:
+            self.backend.add(key, time.time_ns(), timeout=None)
+            version = self.backend.get(key)
+        return version
+
+    def bump(self, object_id):
+        """
+        Invalidates every cached payload of an object.
+        """
+        key = self._version_key(object_id)
+        try:
+            self.backend.incr(key)
+        except ValueError:
+            self.backend.set(key, time.time_ns(), timeout=None)
+
+    def bump_many(self, object_ids):
+        """
+        Invalidates every cached payload of several objects with one cache write.
+
+        The new versions are the current time in nanoseconds, which is past any
+        version handed out before.
+        """
+        version = time.time_ns()
+        self.backend.set_many(
+            {self._version_key(object_id): version for object_id in object_ids},
+            timeout=None,
+        )
+
+    def bump_on_commit(self, object_id):
+        """
+        Bumps the object's version once the current transaction commits.
+        """
+        transaction.on_commit(lambda: self.bump(object_id))
+
+    def get_or_set(self, object_id, build, variant=""):
+        """
+        Returns the cached payload of an object, building and storing it on a miss.
+
+        The cache key is computed before `build` runs, so a payload built while a
+        writer bumps the version is stored under the old, already stale, key.
+        `variant` (for example a URL) is hashed to keep keys short and safe for any
+        backend.
+        """
+        digest = hashlib.md5(variant.encode("utf-8"), usedforsecurity=False).hexdigest()
+        key = f"{self.namespace}:{object_id}:{self.version(object_id)}:{digest}"
+        # A client pinned to the primary after writing skips the cached payload,
+        # which may have been built from a replica that had not caught up yet, and
+        # replaces it with a fresh one.
+        if not router.pinned_to_primary():
+            payload = self.backend.get(key)
+            if payload is not None:
+                self._count(hit=True)
+                return payload, True
+
+        self._count(hit=False)
+        payload = build()
+        timeout = self.timeout
+        if router.current_read_database() != DEFAULT_DB_ALIAS:
+            # Replica payloads may be stale; keep them no longer than replicas lag.
+            timeout = min(timeout or router.pin_seconds(), router.pin_seconds())
+        self.backend.set(key, payload, timeout=timeout)
+        return payload, False
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """
+        Returns the hit and miss counters of this process.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+book_detail_cache = VersionedCache(
+    "book-detail",
+    timeout=getattr(settings, "BOOK_DETAIL_CACHE_TIMEOUT", 300),
+)
+
+# Public (user independent) pages of the book list, all under the object id "all".
+book_list_cache = VersionedCache(
+    "book-list",
+    timeout=getattr(settings, "BOOK_LIST_CACHE_TIMEOUT", 60),
+)
+
+# Sets of book ids bookmarked by each user, keyed by user id.
+user_bookmarks_cache = VersionedCache(
+    "user-bookmarks",
+    timeout=getattr(settings, "USER_BOOKMARKS_CACHE_TIMEOUT", 3600),
+)
@@ -0,0 +1,172 @@
+"""
+Compares the latency of the sync and async read endpoints under concurrent load.
+"""
+
+import asyncio
+import time
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+
+from warehouse.models import Book
+
+
+class Command(BaseCommand):
+    """
+    Drives the ASGI application in process, the way an ASGI server such as uvicorn
+    calls it, with a number of concurrent connections that each send requests back
+    to back. For every concurrency level it reports requests per second and p50 and
+    p99 latency of the book list, book detail and review list endpoints, sync (DRF)
+    and async.
+
+    The sync book list and detail serve cached payloads after the first request, the
+    async views always query, so those rows compare a cache hit against the async
+    ORM rather than like for like.
+    """
+
+    help = "Compare p50/p99 latency of the sync and async read endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[100, 500, 1000],
+            help="Numbers of concurrent connections to test.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=3,
+            help="Number of requests sent by each connection.",
+        )
+        parser.add_argument(
+            "--book",
+            type=int,
+            help="Book used for the detail and review list; defaults to the latest "
+            "reviewed book.",
+        )
+        parser.add_argument(
+            "--host",
+            default="localhost",
+            help="Host header of the requests; must be allowed by ALLOWED_HOSTS.",
+        )
+
+    def handle(self, *args, **options):
+        book_id = options["book"] or (
+            Book.objects.filter(reviews__isnull=False)
+            .order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if book_id is None:
+            raise CommandError("No reviewed book to benchmark; pass --book.")
+
+        endpoints = (
+            ("book list", "/books/", "/books/async/"),
+            ("book detail", f"/books/{book_id}/", f"/books/async/{book_id}/"),
+            (
+                "review list",
+                f"/books/{book_id}/reviews/",
+                f"/books/async/{book_id}/reviews/",
+            ),
+        )
+        application = get_asgi_application()
+        self.stdout.write(
+            f"{'connections':>11} {'endpoint':<12} {'view':<5} {'req/s':>8} "
+            f"{'p50 ms':>8} {'p99 ms':>8} {'errors':>6}"
+        )
+        for concurrency in options["concurrency"]:
+            for name, sync_path, async_path in endpoints:
+                for label, path in (("sync", sync_path), ("async", async_path)):
+                    latencies, errors, elapsed = asyncio.run(
+                        self.load(
+                            application,
+                            path,
+                            concurrency,
+                            options["requests"],
+                            options["host"],
+                        )
+                    )
+                    self.report(concurrency, name, label, latencies, errors, elapsed)
+
+    async def load(self, application, path, concurrency, requests, host):
+        """
+        Runs `concurrency` connections sending `requests` requests each and returns
+        the latencies of the successful ones, the error count and the elapsed time.
+        """
+        latencies, errors = [], 0
+
+        async def connection():
+            nonlocal errors
+            for _ in range(requests):
+                began = time.perf_counter()
+                status = await self.request(application, path, host)
+                if status == 200:
+                    latencies.append(time.perf_counter() - began)
+                else:
+                    errors += 1
+
+        began = time.perf_counter()
+        await asyncio.gather(*(connection() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - began
+
+    @staticmethod
+    async def request(application, path, host):
+        """
+        Sends one GET request to the ASGI application and returns the status code.
+        """
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("ascii"),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", host.encode("ascii")),
+                (b"accept", b"application/json"),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": (host, 80),
+        }
+        finished = asyncio.Event()
+        received = False
+        status = None
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body"
+            ):
+                finished.set()
+
+        await application(scope, receive, send)
+        return status
+
+    def report(self, concurrency, name, label, latencies, errors, elapsed):
+        latencies.sort()
+
+        def percentile(value):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * value))]
+
+        self.stdout.write(
+            f"{concurrency:>11} {name:<12} {label:<5} "
+            f"{len(latencies) / elapsed:8.0f} {percentile(0.5) * 1e3:8.1f} "
+            f"{percentile(0.99) * 1e3:8.1f} {errors:>6}"
+        )
@@ -0,0 +1,133 @@
+"""
+Compares the encode time and size of the API's response formats.
+"""
+
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from goodreads.parsers import FastJSONParser, MessagePackParser
+from goodreads.renderers import FastJSONRenderer, MessagePackRenderer, orjson
+from warehouse.api.v1.serializers import (
+    BookDetailSerializer,
+    BookRowSerializer,
+    ReviewRowSerializer,
+)
+from warehouse.models import Book, Review
+
+
+class Command(BaseCommand):
+    """
+    Renders a book list page, a book detail and a review list page with each
+    renderer, checks that every format parses back to the same data and reports the
+    encode time and the size in bytes.
+    """
+
+    help = "Compare encode time and size of the JSON and MessagePack renderers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100,
+            help="Number of books and reviews in the list payloads.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=200,
+            help="Number of encodes per run.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of runs; the fastest one is reported.",
+        )
+
+    def handle(self, *args, **options):
+        formats = (
+            ("json (drf)", JSONRenderer(), JSONParser()),
+            (
+                "json (orjson)" if orjson else "json (stdlib)",
+                FastJSONRenderer(),
+                FastJSONParser(),
+            ),
+            ("msgpack", MessagePackRenderer(), MessagePackParser()),
+        )
+        for name, payload in self.payloads(options["rows"]).items():
+            if payload is None:
+                self.stdout.write(f"No data for the {name} payload, skipped.")
+                continue
+            expected = json.loads(JSONRenderer().render(payload))
+            baseline = None
+            for label, renderer, parser in formats:
+                body = renderer.render(payload)
+                if parser.parse(io.BytesIO(body)) != expected:
+                    raise CommandError(f"{label} does not round-trip the {name}.")
+                best = min(
+                    self.timed(renderer, payload, options["iterations"])
+                    for _ in range(options["repeat"])
+                )
+                baseline = baseline or best
+                self.stdout.write(
+                    f"{name:<12} {label:<14} {len(body):8d} bytes "
+                    f"{best * 1e6:9.1f} us/encode {baseline / best:5.1f}x"
+                )
+        self.stdout.write(self.style.SUCCESS("All formats round-trip identically."))
+
+    @staticmethod
+    def payloads(rows):
+        """
+        Returns the serialized payloads of the book list, detail and reviews.
+        """
+        request = Request(APIRequestFactory(SERVER_NAME="localhost").get("/books/"))
+        context = {"request": request}
+
+        books = Book.objects.values("id", "title").order_by("-created", "-id")
+        book_rows = [
+            {**book, "bookmarked_by_user": False, "bookmark_count": 0}
+            for book in books[:rows]
+        ]
+        book = (
+            Book.objects.filter(reviews__isnull=False)
+            .select_related("stats")
+            .order_by("-id")
+            .first()
+        )
+        review_rows = Review.objects.values(
+            "id", "book_id", "user_id", "rating", "comment", "created"
+        ).order_by("-created", "-id")[:rows]
+
+        def page(results):
+            return (
+                {"next": None, "previous": None, "results": results}
+                if results
+                else None
+            )
+
+        return {
+            "book list": page(
+                BookRowSerializer(book_rows, many=True, context=context).data
+            ),
+            "book detail": (
+                BookDetailSerializer(book, context=context).data if book else None
+            ),
+            "review list": page(
+                ReviewRowSerializer(review_rows, many=True, context=context).data
+            ),
+        }
+
+    @staticmethod
+    def timed(renderer, payload, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            renderer.render(payload)
+        return (time.perf_counter() - start) / iterations
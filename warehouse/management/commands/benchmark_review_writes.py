@@ -0,0 +1,138 @@
+"""
+Measures review write throughput and lock errors under concurrent writers.
+"""
+
+import random
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+from account.models import User
+from warehouse.models import Book, Review
+
+
+class Command(BaseCommand):
+    """
+    Runs concurrent writers that create and update reviews, once with the previous
+    `get_object_or_404` plus `update_or_create` path and once with the single
+    statement `Review.objects.upsert`, and reports writes per second, latency
+    percentiles and the number of failed (for example `database is locked`) writes.
+
+    Writes are made by temporary users, which are deleted with their reviews at the
+    end, so the counters of the books are left as they were.
+    """
+
+    help = "Compare review write throughput of update_or_create and the upsert."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Number of concurrent writers, one temporary user each.",
+        )
+        parser.add_argument(
+            "--writes",
+            type=int,
+            default=200,
+            help="Number of review writes per writer.",
+        )
+        parser.add_argument(
+            "--books",
+            type=int,
+            default=20,
+            help="Number of books the writers review; fewer books mean more updates.",
+        )
+
+    def handle(self, *args, **options):
+        book_ids = list(
+            Book.objects.order_by("-id").values_list("id", flat=True)[
+                : options["books"]
+            ]
+        )
+        if not book_ids:
+            raise CommandError("No books to review.")
+
+        users = [
+            User.objects.create_user(
+                username=f"benchmark-{number}@example.invalid",
+                email=f"benchmark-{number}@example.invalid",
+            )
+            for number in range(options["threads"])
+        ]
+        try:
+            for name, write in (
+                ("update_or_create", self.update_or_create),
+                ("upsert", self.upsert),
+            ):
+                Review.objects.filter(user__in=users).delete()
+                self.report(name, self.run(write, users, book_ids, options["writes"]))
+        finally:
+            Review.objects.filter(user__in=users).delete()
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    @staticmethod
+    def update_or_create(user, book_id, rating):
+        with transaction.atomic():
+            book = Book.objects.get(id=book_id)
+            Review.objects.update_or_create(
+                user=user, book=book, defaults={"rating": rating, "comment": None}
+            )
+
+    @staticmethod
+    def upsert(user, book_id, rating):
+        Review.objects.upsert(user, book_id, rating, None)
+
+    @staticmethod
+    def run(write, users, book_ids, writes):
+        """
+        Runs one writer thread per user and returns the latencies and failures.
+        """
+        latencies, failures = [], []
+        lock = threading.Lock()
+        start = threading.Barrier(len(users) + 1)
+
+        def writer(user):
+            own_latencies, own_failures = [], 0
+            rng = random.Random(user.pk)
+            start.wait()
+            try:
+                for _ in range(writes):
+                    began = time.perf_counter()
+                    try:
+                        write(user, rng.choice(book_ids), rng.randint(1, 5))
+                    except OperationalError:
+                        own_failures += 1
+                        continue
+                    own_latencies.append(time.perf_counter() - began)
+            finally:
+                connections.close_all()
+            with lock:
+                latencies.extend(own_latencies)
+                failures.append(own_failures)
+
+        threads = [threading.Thread(target=writer, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return latencies, sum(failures), time.perf_counter() - began
+
+    def report(self, name, result):
+        latencies, failures, elapsed = result
+        latencies.sort()
+
+        def percentile(value):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * value))]
+
+        self.stdout.write(
+            f"{name:<17} {len(latencies) / elapsed:8.0f} writes/s "
+            f"p50 {percentile(0.5) * 1e3:7.2f} ms  p99 {percentile(0.99) * 1e3:7.2f} ms "
+            f"{failures:5d} failed"
+        )
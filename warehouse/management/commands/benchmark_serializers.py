@@ -0,0 +1,118 @@
+"""
+Measures the per-row cost of the model and `values()` row serializers of the list
+endpoints.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import BooleanField, Value
+from django.db.models.functions import Coalesce
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from warehouse.api.v1.serializers import (
+    BookRowSerializer,
+    BookSerializer,
+    ReviewRowSerializer,
+    ReviewSerializer,
+)
+from warehouse.models import Book, Review
+
+
+class Command(BaseCommand):
+    """
+    Serializes the same books and reviews with the ModelSerializer and the row
+    serializer, checks that both render to the same JSON and reports the time per
+    row, including the query and building of the rows.
+    """
+
+    help = "Compare the per-row cost of the model and values() list serializers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1000,
+            help="Number of books and reviews serialized per run.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of runs; the fastest one is reported.",
+        )
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        request = Request(APIRequestFactory(SERVER_NAME="localhost").get("/books/"))
+        context = {"request": request}
+
+        def books_before():
+            books = Book.objects.annotate(
+                bookmark_count=Coalesce("stats__bookmark_count", 0),
+                bookmarked_by_user=Value(False, output_field=BooleanField()),
+            ).order_by("-created", "-id")[:rows]
+            return BookSerializer(books, many=True, context=context).data
+
+        def books_after():
+            books = Book.objects.values(
+                "id",
+                "title",
+                "created",
+                bookmark_count=Coalesce("stats__bookmark_count", 0),
+                bookmarked_by_user=Value(False, output_field=BooleanField()),
+            ).order_by("-created", "-id")[:rows]
+            return BookRowSerializer(books, many=True, context=context).data
+
+        def reviews_before():
+            reviews = Review.objects.order_by("-created", "-id")[:rows]
+            return ReviewSerializer(reviews, many=True, context=context).data
+
+        def reviews_after():
+            reviews = Review.objects.values(
+                "id", "book_id", "user_id", "rating", "comment", "created"
+            ).order_by("-created", "-id")[:rows]
+            return ReviewRowSerializer(reviews, many=True, context=context).data
+
+        for name, before, after in (
+            ("books", books_before, books_after),
+            ("reviews", reviews_before, reviews_after),
+        ):
+            self.compare(name, before, after, repeat)
+
+    def compare(self, name, before, after, repeat):
+        """
+        Times both serializers and writes the per-row cost of each.
+        """
+        renderer = JSONRenderer()
+        expected, actual = before(), after()
+        if not expected:
+            self.stdout.write(f"No {name} to serialize, skipped.")
+            return
+        if renderer.render(expected) != renderer.render(actual):
+            raise CommandError(f"The {name} row serializer output differs.")
+
+        count = len(expected)
+        timings = {}
+        for label, serialize in (("model", before), ("values", after)):
+            best = min(self.timed(serialize) for _ in range(repeat))
+            timings[label] = best
+            self.stdout.write(
+                f"{name:<8} {label:<7} {count} rows: "
+                f"{best * 1000:8.2f} ms, {best / count * 1e6:7.2f} us/row"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{name}: identical output, "
+                f"{timings['model'] / timings['values']:.1f}x faster per row."
+            )
+        )
+
+    @staticmethod
+    def timed(serialize):
+        start = time.perf_counter()
+        serialize()
+        return time.perf_counter() - start
@@ -0,0 +1,77 @@
+"""
+Exports the book catalog with per-book statistics as NDJSON or CSV.
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from warehouse.export import RENDERERS, BookExport
+
+
+class Command(BaseCommand):
+    """
+    Streams every book, with its bookmark and review counts, average rating and
+    rating histogram, to a file or standard output and reports the throughput.
+    """
+
+    help = "Export all books with their statistics as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=sorted(RENDERERS),
+            default="ndjson",
+            help="Output format.",
+        )
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="File to write to; '-' writes to standard output.",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compress the output with gzip.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows fetched from the database at a time.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to export from.",
+        )
+
+    def handle(self, *args, **options):
+        export = BookExport(
+            export_format=options["format"],
+            chunk_size=options["chunk_size"],
+            compress=options["gzip"],
+            using=options["database"],
+        )
+
+        if options["output"] == "-":
+            self.write(export, sys.stdout.buffer)
+            report = self.stderr
+        else:
+            with open(options["output"], "wb") as output:
+                self.write(export, output)
+            report = self.stdout
+
+        report.write(
+            self.style.SUCCESS(
+                f"Exported {export.rows} books ({export.bytes} bytes) in "
+                f"{export.elapsed:.2f}s, {export.rows_per_second:.0f} rows/s."
+            )
+        )
+
+    @staticmethod
+    def write(export, output):
+        for chunk in export:
+            output.write(chunk)
+        output.flush()
@@ -0,0 +1,262 @@
+"""
+Imports books in bulk from a CSV or JSON Lines file.
+"""
+
+import csv
+import gzip
+import json
+import logging
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from warehouse import search
+from warehouse.cache import book_detail_cache, book_list_cache
+from warehouse.models import Book, BookStats
+
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+class Command(BaseCommand):
+    """
+    Loads books with batched `bulk_create`, one transaction per batch.
+
+    Titles are unique: with `--on-conflict ignore` existing books are left as they
+    are, with `--on-conflict update` their summary is replaced. Every batch also
+    creates the statistics rows and search index entries of its books, since bulk
+    inserts do not send the model signals that normally maintain them.
+
+    `--defer-indexes` drops the secondary indexes of the books table and skips the
+    search index while loading, then rebuilds both at the end. The unique index on
+    the title is kept, as conflicts are detected through it.
+    """
+
+    help = "Import books from a CSV or JSON Lines file in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help="File with `title` and optional `summary` columns or keys; '-' reads "
+            "standard input. Files ending in .gz are decompressed.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(set(FORMATS.values())),
+            help="Input format; guessed from the file name by default.",
+        )
+        parser.add_argument(
+            "--on-conflict",
+            choices=("ignore", "update"),
+            default="ignore",
+            help="What to do with books whose title already exists.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of books inserted per transaction.",
+        )
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help="Rebuild secondary and search indexes once at the end.",
+        )
+        parser.add_argument(
+            "--progress-every",
+            type=int,
+            default=100000,
+            help="Report progress every this many rows.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to import into.",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        update = options["on_conflict"] == "update"
+        defer = options["defer_indexes"]
+
+        self.verbosity = options["verbosity"]
+        self.skipped = 0
+        rows = self.clean(self.read(options["path"], options["format"]))
+        books_before = Book.objects.using(using).count()
+        started = time.perf_counter()
+        total, existing, next_report, updated_ids = 0, 0, options["progress_every"], []
+
+        dropped = self.drop_indexes(using, Book._meta.indexes if defer else [])
+        try:
+            while batch := list(islice(rows, options["batch_size"])):
+                book_ids, batch_existing = self.load_batch(
+                    batch, using, update, not defer
+                )
+                existing += batch_existing
+                if update:
+                    updated_ids.extend(book_ids)
+                total += len(batch)
+                if total >= next_report:
+                    next_report += options["progress_every"]
+                    self.report_progress(total, started)
+        finally:
+            self.create_indexes(using, dropped)
+
+        if defer:
+            self.stdout.write("Rebuilding the search index...")
+            search.rebuild(using)
+        book_list_cache.bump("all")
+        if updated_ids:
+            book_detail_cache.bump_many(updated_ids)
+
+        elapsed = time.perf_counter() - started
+        inserted = Book.objects.using(using).count() - books_before
+        duplicates = total - inserted - existing
+        logger.info(
+            "Imported books: %s rows, %s inserted, %s existing, %s duplicates, "
+            "%s skipped in %.2fs",
+            total,
+            inserted,
+            existing,
+            duplicates,
+            self.skipped,
+            elapsed,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Read {total} books in {elapsed:.2f}s "
+                f"({total / elapsed if elapsed else 0:.0f} rows/s): {inserted} "
+                f"inserted, {existing} {'updated' if update else 'already existing'}, "
+                f"{duplicates} repeated titles in the same batch, "
+                f"{self.skipped} invalid rows skipped."
+            )
+        )
+
+    def read(self, path, input_format):
+        """
+        Yields the rows of the input file as dictionaries.
+        """
+        name = path[:-3] if path.endswith(".gz") else path
+        input_format = input_format or next(
+            (value for suffix, value in FORMATS.items() if name.endswith(suffix)), None
+        )
+        if input_format is None:
+            raise CommandError("Cannot guess the input format; pass --format.")
+
+        if path == "-":
+            stream = sys.stdin
+        elif path.endswith(".gz"):
+            stream = gzip.open(path, "rt", encoding="utf-8", newline="")
+        else:
+            stream = open(path, encoding="utf-8", newline="")
+
+        try:
+            if input_format == "csv":
+                yield from csv.DictReader(stream)
+                return
+            for number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    self.skip(number, f"invalid JSON: {e}")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+    def clean(self, rows):
+        """
+        Yields `{"title", "summary"}` dictionaries, skipping rows without a valid
+        title.
+        """
+        max_length = Book._meta.get_field("title").max_length
+        for number, row in enumerate(rows, start=1):
+            title = row.get("title") if isinstance(row, dict) else None
+            if not isinstance(title, str) or not title.strip():
+                self.skip(number, "missing title")
+                continue
+            title = title.strip()
+            if len(title) > max_length:
+                self.skip(number, f"title longer than {max_length} characters")
+                continue
+            yield {"title": title, "summary": row.get("summary") or None}
+
+    def skip(self, number, reason):
+        self.skipped += 1
+        if self.verbosity > 1:
+            self.stderr.write(f"Row {number} skipped: {reason}.")
+
+    @staticmethod
+    def load_batch(batch, using, update, index_search):
+        """
+        Inserts or updates one batch of books in a transaction.
+
+        Returns the ids of the batch's books and how many of its distinct titles
+        already existed. A title repeated in a later batch counts as existing there.
+        """
+        # The last row wins when a title appears more than once in the batch.
+        summaries = {row["title"]: row["summary"] for row in batch}
+        with transaction.atomic(using=using):
+            existing = Book.objects.using(using).filter(title__in=summaries).count()
+            Book.objects.using(using).bulk_create(
+                [
+                    Book(title=title, summary=summary)
+                    for title, summary in summaries.items()
+                ],
+                ignore_conflicts=not update,
+                update_conflicts=update,
+                unique_fields=["title"] if update else None,
+                update_fields=["summary", "modified"] if update else None,
+            )
+            books = list(
+                Book.objects.using(using)
+                .filter(title__in=summaries)
+                .values_list("id", "title", "summary")
+            )
+            book_ids = [book_id for book_id, _, _ in books]
+            BookStats.objects.db_manager(using).ensure_many(book_ids)
+            if index_search:
+                search.index_books(books, using)
+        return book_ids, existing
+
+    def report_progress(self, total, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)"
+        )
+
+    def drop_indexes(self, using, indexes):
+        """
+        Drops those of `indexes` that exist and returns them.
+        """
+        if not indexes:
+            return []
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            existing = connection.introspection.get_constraints(
+                cursor, Book._meta.db_table
+            )
+        indexes = [index for index in indexes if index.name in existing]
+        self.stdout.write(f"Dropping {len(indexes)} indexes of the books table...")
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.remove_index(Book, index)
+        return indexes
+
+    def create_indexes(self, using, indexes):
+        if not indexes:
+            return
+        self.stdout.write(f"Recreating {len(indexes)} indexes of the books table...")
+        with connections[using].schema_editor() as editor:
+            for index in indexes:
+                editor.add_index(Book, index)
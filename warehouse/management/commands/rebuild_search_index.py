@@ -0,0 +1,51 @@
+"""
+Rebuilds the full-text search index of books and reviews.
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from warehouse import search
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Drops and repopulates the FTS5 tables from the books and reviews tables.
+    """
+
+    help = "Rebuild the full-text search index of books and reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to rebuild the index on.",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if not search.is_supported(using):
+            self.stdout.write(
+                self.style.WARNING(
+                    "The database does not support FTS5; search uses LIKE matching."
+                )
+            )
+            return
+
+        started = time.perf_counter()
+        with transaction.atomic(using=using):
+            books, reviews = search.rebuild(using)
+        elapsed = time.perf_counter() - started
+
+        logger.info("Rebuilt search index: %s books, %s reviews", books, reviews)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {books} books and {reviews} reviews in {elapsed:.2f}s."
+            )
+        )
@@ -0,0 +1,113 @@
+"""
+Rebuilds the denormalized BookStats counters from the bookmarks and reviews tables.
+"""
+
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from warehouse.models import Book, Bookmark, BookStats, Review
+from warehouse.models.book_stats import RATING_VALUES
+
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = (
+    "bookmark_count",
+    "review_count",
+    "rating_count",
+    "rating_sum",
+) + tuple(f"rating_{value}" for value in RATING_VALUES)
+
+
+class Command(BaseCommand):
+    """
+    Recomputes every book's counters in one GROUP BY pass per source table, reports
+    the rows that drifted and writes the correct values back.
+    """
+
+    help = "Rebuild BookStats counters from source tables and report any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drift, do not write corrected counters.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows written per bulk query.",
+        )
+
+    def handle(self, *args, **options):
+        expected = self.expected_counters()
+        stored = {stats.book_id: stats for stats in BookStats.objects.all()}
+
+        missing, drifted = [], []
+        for book_id in Book.objects.values_list("id", flat=True).iterator():
+            counters = expected.get(book_id, {})
+            stats = stored.get(book_id)
+            if stats is None:
+                missing.append(BookStats(book_id=book_id, **counters))
+                continue
+
+            changes = {
+                field: (getattr(stats, field), counters.get(field, 0))
+                for field in COUNTER_FIELDS
+                if getattr(stats, field) != counters.get(field, 0)
+            }
+            if changes:
+                for field, (_, value) in changes.items():
+                    setattr(stats, field, value)
+                drifted.append(stats)
+                if options["verbosity"] > 1:
+                    self.stdout.write(
+                        f"Book {book_id}: "
+                        + ", ".join(
+                            f"{field} {old} -> {new}"
+                            for field, (old, new) in changes.items()
+                        )
+                    )
+
+        self.stdout.write(
+            f"{len(drifted)} drifted and {len(missing)} missing statistics rows."
+        )
+        if options["dry_run"] or not (drifted or missing):
+            return
+
+        with transaction.atomic():
+            BookStats.objects.bulk_create(
+                missing, batch_size=options["batch_size"], ignore_conflicts=True
+            )
+            BookStats.objects.bulk_update(
+                drifted, COUNTER_FIELDS, batch_size=options["batch_size"]
+            )
+        logger.info(
+            "Reconciled book statistics: %s drifted, %s missing",
+            len(drifted),
+            len(missing),
+        )
+        self.stdout.write(self.style.SUCCESS("Book statistics reconciled."))
+
+    @staticmethod
+    def expected_counters():
+        """
+        Returns the correct counters of every book that has bookmarks or reviews.
+        """
+        expected = {}
+        reviews = Review.objects.rating_stats_by_book()
+        for row in reviews.iterator():
+            expected[row.pop("book_id")] = row
+
+        bookmarks = Bookmark.objects.values("book_id").annotate(
+            bookmark_count=Count("id")
+        )
+        for row in bookmarks.order_by().iterator():
+            expected.setdefault(row["book_id"], {})["bookmark_count"] = row[
+                "bookmark_count"
+            ]
+        return expected
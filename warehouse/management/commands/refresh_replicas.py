@@ -0,0 +1,72 @@
+"""
+Refreshes the local SQLite read replicas from the primary database.
+"""
+
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    """
+    Copies the primary database into every replica in `DATABASE_REPLICAS` with
+    SQLite's online backup API, schema and search index included. The backup reads
+    a consistent snapshot; with WAL it does not block writers on the primary.
+
+    With `--interval` the copy is repeated until interrupted. Keep the interval below
+    `REPLICA_PIN_SECONDS`, so clients that wrote read from the primary until the
+    replicas have caught up.
+    """
+
+    help = "Copy the primary SQLite database into the read replicas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Seconds between refreshes; 0 refreshes once.",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=-1,
+            help="Pages copied per backup step; -1 copies everything in one step.",
+        )
+
+    def handle(self, *args, **options):
+        replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        if not replicas:
+            raise CommandError(
+                "No read replicas configured; set SQLITE_READ_REPLICAS or "
+                "DATABASE_REPLICAS."
+            )
+        for alias in [DEFAULT_DB_ALIAS, *replicas]:
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(f"Database {alias} is not an SQLite database.")
+
+        while True:
+            for alias in replicas:
+                elapsed = self.refresh(alias, options["pages"])
+                self.stdout.write(f"Refreshed {alias} in {elapsed:.2f}s.")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    @staticmethod
+    def refresh(alias, pages):
+        """
+        Copies the primary into the replica `alias` and returns the elapsed time.
+        """
+        started = time.perf_counter()
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        target = sqlite3.connect(connections[alias].settings_dict["NAME"], timeout=30)
+        try:
+            primary.connection.backup(target, pages=pages)
+        finally:
+            target.close()
+        return time.perf_counter() - started
@@ -0,0 +1,194 @@
+"""
+Stress tests concurrent writes against the stock and the tuned SQLite backends.
+"""
+
+import random
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+
+BACKENDS = {
+    "stock": ("django.db.backends.sqlite3", {}),
+    "tuned": ("goodreads.db.sqlite3", {"transaction_mode": "IMMEDIATE"}),
+}
+
+
+class Command(BaseCommand):
+    """
+    Runs concurrent writers and readers against a scratch SQLite database, once with
+    Django's stock backend and default options and once with `goodreads.db.sqlite3`
+    in IMMEDIATE transaction mode, and reports the rate of failed writes.
+
+    Each write is a transaction that reads a counter and writes it back incremented,
+    the read-then-write shape of the review and bookmark paths, while readers keep
+    scanning the table. The counters are checked against the successful writes
+    afterwards, so lost updates would show up as well. The project database is not
+    touched.
+    """
+
+    help = "Compare write error rates of the stock and tuned SQLite backends."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers",
+            type=int,
+            default=16,
+            help="Number of concurrent writer threads.",
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=4,
+            help="Number of concurrent reader threads.",
+        )
+        parser.add_argument(
+            "--writes",
+            type=int,
+            default=200,
+            help="Number of write transactions per writer.",
+        )
+        parser.add_argument(
+            "--counters",
+            type=int,
+            default=10,
+            help="Number of counter rows the writers update.",
+        )
+        parser.add_argument(
+            "--backend",
+            choices=sorted(BACKENDS),
+            action="append",
+            help="Backend to test; may be repeated. Defaults to all of them.",
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(tempfile.mkdtemp(prefix="stress-sqlite-"))
+        try:
+            for name in options["backend"] or sorted(BACKENDS):
+                alias = f"stress_{name}"
+                engine, engine_options = BACKENDS[name]
+                connections.settings[alias] = {
+                    **connections["default"].settings_dict,
+                    "ENGINE": engine,
+                    "NAME": str(directory / f"{name}.sqlite3"),
+                    "OPTIONS": engine_options,
+                    "CONN_MAX_AGE": 0,
+                }
+                try:
+                    self.report(name, self.run(alias, options))
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    @staticmethod
+    def run(alias, options):
+        """
+        Runs the writers and readers and returns their outcome.
+        """
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE counters (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            cursor.executemany(
+                "INSERT INTO counters (id, value) VALUES (%s, 0)",
+                [(number,) for number in range(options["counters"])],
+            )
+
+        lock = threading.Lock()
+        latencies, failures, errors = [], [0], {}
+        done = threading.Event()
+        start = threading.Barrier(options["writers"] + options["readers"] + 1)
+
+        def write(counter):
+            with transaction.atomic(using=alias):
+                with connections[alias].cursor() as cursor:
+                    cursor.execute(
+                        "SELECT value FROM counters WHERE id = %s", [counter]
+                    )
+                    (value,) = cursor.fetchone()
+                    cursor.execute(
+                        "UPDATE counters SET value = %s WHERE id = %s",
+                        [value + 1, counter],
+                    )
+
+        def writer(seed):
+            rng = random.Random(seed)
+            own_latencies, own_errors = [], {}
+            start.wait()
+            try:
+                for _ in range(options["writes"]):
+                    began = time.perf_counter()
+                    try:
+                        write(rng.randrange(options["counters"]))
+                    except OperationalError as e:
+                        own_errors[str(e)] = own_errors.get(str(e), 0) + 1
+                        continue
+                    own_latencies.append(time.perf_counter() - began)
+            finally:
+                connections[alias].close()
+            with lock:
+                latencies.extend(own_latencies)
+                for message, count in own_errors.items():
+                    errors[message] = errors.get(message, 0) + count
+                    failures[0] += count
+
+        def reader():
+            start.wait()
+            try:
+                while not done.is_set():
+                    try:
+                        with connections[alias].cursor() as cursor:
+                            cursor.execute("SELECT COUNT(*), SUM(value) FROM counters")
+                            cursor.fetchone()
+                    except OperationalError:
+                        pass
+            finally:
+                connections[alias].close()
+
+        writers = [
+            threading.Thread(target=writer, args=(seed,))
+            for seed in range(options["writers"])
+        ]
+        readers = [threading.Thread(target=reader) for _ in range(options["readers"])]
+        for thread in writers + readers:
+            thread.start()
+        start.wait()
+        began = time.perf_counter()
+        for thread in writers:
+            thread.join()
+        elapsed = time.perf_counter() - began
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT SUM(value) FROM counters")
+            (total,) = cursor.fetchone()
+        return {
+            "attempted": options["writers"] * options["writes"],
+            "latencies": sorted(latencies),
+            "failed": failures[0],
+            "errors": errors,
+            "elapsed": elapsed,
+            "lost": len(latencies) - total,
+        }
+
+    def report(self, name, result):
+        latencies = result["latencies"]
+        p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0.0
+        self.stdout.write(
+            f"{name:<6} {len(latencies) / result['elapsed']:8.0f} writes/s "
+            f"p99 {p99 * 1e3:8.1f} ms  {result['failed']:6d} of "
+            f"{result['attempted']} failed "
+            f"({100 * result['failed'] / result['attempted']:.1f}%), "
+            f"{result['lost']} lost updates"
+        )
+        for message, count in sorted(result["errors"].items()):
+            self.stdout.write(f"       {count:6d} x {message}")
@@ -1,5 +1,6 @@
 """ initializing modules"""
 
 from .book import Book
+from .book_stats import BookStats
 from .bookmark import Bookmark
 from .review import Review
@@ -40,6 +40,7 @@ class Book(TimeStampMixin):
         get_latest_by = ("created", "modified")
         indexes = [
             models.Index(fields=("title",), name="title_idx"),
+            models.Index(fields=("created", "id"), name="book_created_id_idx"),
         ]
 
     def __str__(self) -> str:
@@ -0,0 +1,189 @@
+"""
+This module contains the BookStats model.
+"""
+
+from django.db import connections, models, router
+from django.db.models import Case, Exists, F, IntegerField, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.utils.translation import gettext_lazy as _
+
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+
+def review_counters(rating, sign=1):
+    """
+    Returns the counter changes of adding (`sign=1`) or removing (`sign=-1`) a
+    review with `rating`.
+    """
+    counters = {"review_count": sign}
+    if rating is not None:
+        counters["rating_count"] = sign
+        counters["rating_sum"] = sign * rating
+        counters[f"rating_{rating}"] = sign
+    return counters
+
+
+class BookStatsManager(models.Manager):
+    """
+    Applies counter deltas to BookStats rows with single UPDATE statements.
+    """
+
+    def ensure(self, book_ids):
+        """
+        Creates missing stats rows for `book_ids` in a single INSERT.
+        """
+        self.bulk_create(
+            [self.model(book_id=book_id) for book_id in book_ids],
+            ignore_conflicts=True,
+        )
+
+    def ensure_many(self, book_ids):
+        """
+        Creates missing stats rows for many books with one batched statement.
+
+        Unlike `ensure`, no model instances are built, which matters for bulk loads
+        of books. The counters of new rows start at zero.
+        """
+        using = self._db or router.db_for_write(self.model)
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        counters = [
+            field.column
+            for field in self.model._meta.concrete_fields
+            if not field.primary_key
+        ]
+        sql = (
+            f"INSERT INTO {quote(self.model._meta.db_table)} "
+            f"({', '.join(quote(column) for column in ['book_id', *counters])}) "
+            f"VALUES (%s{', 0' * len(counters)}) ON CONFLICT DO NOTHING"
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, [(book_id,) for book_id in book_ids])
+
+    def add_bookmarks(self, book_id, delta):
+        """
+        Adds `delta` (positive or negative) to the bookmark count of a book.
+        """
+        return self.filter(book_id=book_id).update(
+            bookmark_count=F("bookmark_count") + delta
+        )
+
+    def add_review(self, book_id, rating, sign=1):
+        """
+        Adds (`sign=1`) or removes (`sign=-1`) a review with `rating` to a book's
+        counters.
+        """
+        return self.filter(book_id=book_id).update(
+            **{
+                field: F(field) + delta
+                for field, delta in review_counters(rating, sign).items()
+            }
+        )
+
+    def apply_deltas(self, deltas):
+        """
+        Adds per-book counter changes, given as `{book_id: {field: delta}}`, with a
+        single UPDATE of CASE expressions.
+        """
+        fields = {field for changes in deltas.values() for field in changes}
+        if not fields:
+            return 0
+        return self.filter(book_id__in=deltas).update(
+            **{
+                field: F(field)
+                + Case(
+                    *(
+                        When(book_id=book_id, then=Value(changes[field]))
+                        for book_id, changes in deltas.items()
+                        if changes.get(field)
+                    ),
+                    default=Value(0),
+                )
+                for field in fields
+            }
+        )
+
+    def retract_review(self, reviews):
+        """
+        Removes the stored review matched by `reviews` from its book's counters.
+
+        `reviews` is a Review queryset matching at most one row. Its current rating
+        is read through subqueries inside the UPDATE, so no separate SELECT is
+        needed. Nothing changes when the queryset matches no row.
+        """
+
+        def matched(queryset):
+            return Cast(Exists(queryset), IntegerField())
+
+        return self.filter(book_id=Subquery(reviews.values("book_id")[:1])).update(
+            review_count=F("review_count") - 1,
+            rating_count=F("rating_count")
+            - matched(reviews.filter(rating__isnull=False)),
+            rating_sum=F("rating_sum")
+            - Coalesce(Subquery(reviews.values("rating")[:1]), 0),
+            **{
+                f"rating_{value}": F(f"rating_{value}")
+                - matched(reviews.filter(rating=value))
+                for value in RATING_VALUES
+            },
+        )
+
+
+class BookStats(models.Model):
+    """
+    BookStats Model
+
+    Holds denormalized bookmark and review counters for a single book. The counters
+    are maintained on write (see `warehouse.signals`) so reads are single-row
+    lookups instead of aggregates over the bookmarks and reviews tables. The
+    `reconcile_book_stats` management command rebuilds them from source.
+    """
+
+    book = models.OneToOneField(
+        "Book",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name=_("Book"),
+        help_text=_("The book these statistics belong to."),
+    )
+
+    bookmark_count = models.IntegerField(_("Bookmark count"), default=0)
+    review_count = models.IntegerField(_("Review count"), default=0)
+    rating_count = models.IntegerField(
+        _("Rating count"),
+        default=0,
+        help_text=_("Number of reviews that carry a rating."),
+    )
+    rating_sum = models.IntegerField(_("Rating sum"), default=0)
+    rating_1 = models.IntegerField(_("1 star ratings"), default=0)
+    rating_2 = models.IntegerField(_("2 star ratings"), default=0)
+    rating_3 = models.IntegerField(_("3 star ratings"), default=0)
+    rating_4 = models.IntegerField(_("4 star ratings"), default=0)
+    rating_5 = models.IntegerField(_("5 star ratings"), default=0)
+
+    objects = BookStatsManager()
+
+    class Meta:
+        verbose_name = _("Book statistics")
+        verbose_name_plural = _("Book statistics")
+
+    def __str__(self):
+        return f"Statistics of book {self.book_id}"
+
+    @property
+    def average_rating(self):
+        """
+        Returns the mean rating, or None if the book has no ratings.
+        """
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @property
+    def rating_distribution(self):
+        """
+        Returns a mapping of star value to the number of ratings with that value.
+        """
+        return {value: getattr(self, f"rating_{value}") for value in RATING_VALUES}
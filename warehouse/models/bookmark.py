@@ -2,11 +2,138 @@
 This module contains the Bookmark model. """
 
 from django.conf import settings
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from goodreads.mixins import TimeStampMixin
 
+from .book import Book
+from .book_stats import BookStats
+from .review import Review
+
+
+class BookmarkManager(models.Manager):
+    """
+    Bookmark manager with set-based bulk changes.
+    """
+
+    def apply_for_user(self, user, add, remove):
+        """
+        Bookmarks the books in `add` and unbookmarks those in `remove` for `user`.
+
+        `add` must only hold existing books the user may bookmark. The changes are
+        one `INSERT ... ON CONFLICT DO NOTHING` and one filtered DELETE, which skip
+        the per-row signals, so the bookmark counters of the touched books are then
+        recounted with one UPDATE.
+        """
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            self.db_manager(using).bulk_create(
+                [self.model(user=user, book_id=book_id) for book_id in add],
+                ignore_conflicts=True,
+            )
+            removed = self._delete_for_user(user.pk, remove, using) if remove else 0
+            self.recount(set(add) | set(remove), using)
+        return removed
+
+    def toggle(self, user, book_id):
+        """
+        Removes the user's bookmark on a book, or creates it if there was none.
+
+        The delete runs first; only when it removed nothing is the bookmark inserted
+        with `INSERT ... SELECT ... WHERE` the book exists and the user has not
+        reviewed it, `ON CONFLICT DO NOTHING`. The unique `(user, book)` constraint
+        makes a concurrent duplicate insert a no-op instead of an IntegrityError, and
+        the book counter is adjusted in the same transaction, so racing toggles
+        always leave the bookmark and its count consistent.
+
+        Returns "removed", "created", "bookmarked" (a concurrent request created it
+        first, so this one changed nothing), "reviewed" or "not_found". The model
+        signals are bypassed, so the caller invalidates the caches.
+        """
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            if self._delete_for_user(user.pk, [book_id], using):
+                BookStats.objects.db_manager(using).add_bookmarks(book_id, -1)
+                return "removed"
+
+            if self._insert_unless_reviewed(user.pk, book_id, using):
+                BookStats.objects.db_manager(using).add_bookmarks(book_id, 1)
+                return "created"
+
+            if not Book.objects.using(using).filter(pk=book_id).exists():
+                return "not_found"
+            if Review.objects.using(using).filter(user=user, book_id=book_id).exists():
+                return "reviewed"
+            return "bookmarked"
+
+    def _delete_for_user(self, user_id, book_ids, using):
+        """
+        Deletes the user's bookmarks of `book_ids` with one DELETE statement, without
+        loading them or sending signals, and returns the number of deleted rows.
+        """
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        opts = self.model._meta
+        placeholders = ", ".join(["%s"] * len(book_ids))
+        sql = (
+            f"DELETE FROM {quote(opts.db_table)} "
+            f"WHERE {quote(opts.get_field('user').column)} = %s "
+            f"AND {quote(opts.get_field('book').column)} IN ({placeholders})"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [user_id, *book_ids])
+            return cursor.rowcount
+
+    def _insert_unless_reviewed(self, user_id, book_id, using):
+        """
+        Inserts one bookmark in a single statement, unless the book is missing, the
+        user reviewed it or the bookmark exists, and returns the inserted row count.
+        """
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        opts = self.model._meta
+        created = opts.get_field("created")
+        now = created.get_db_prep_save(timezone.now(), connection)
+
+        def column(model, name):
+            return quote(model._meta.get_field(name).column)
+
+        sql = (
+            f"INSERT INTO {quote(opts.db_table)} "
+            f"({column(self.model, 'created')}, {column(self.model, 'modified')}, "
+            f"{column(self.model, 'book')}, {column(self.model, 'user')}) "
+            f"SELECT %s, %s, %s, %s WHERE "
+            f"EXISTS (SELECT 1 FROM {quote(Book._meta.db_table)} WHERE "
+            f"{quote(Book._meta.pk.column)} = %s) AND "
+            f"NOT EXISTS (SELECT 1 FROM {quote(Review._meta.db_table)} WHERE "
+            f"{column(Review, 'book')} = %s AND {column(Review, 'user')} = %s) "
+            f"ON CONFLICT DO NOTHING"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [now, now, book_id, user_id, book_id, book_id, user_id])
+            return cursor.rowcount
+
+    def recount(self, book_ids, using=None):
+        """
+        Sets the bookmark count of `book_ids` from the bookmarks table.
+        """
+        counts = (
+            self.model.objects.filter(book=OuterRef("book_id"))
+            .order_by()
+            .values("book")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return (
+            BookStats.objects.db_manager(using)
+            .filter(book_id__in=book_ids)
+            .update(bookmark_count=Coalesce(Subquery(counts), 0))
+        )
+
 
 class Bookmark(TimeStampMixin):
     """
@@ -34,6 +161,8 @@ class Bookmark(TimeStampMixin):
         help_text=_("The user associated with the bookmark."),
     )
 
+    objects = BookmarkManager()
+
     class Meta:
         """meta class"""
 
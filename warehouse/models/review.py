@@ -2,11 +2,153 @@
 
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from goodreads.mixins import TimeStampMixin
 
+from .book_stats import BookStats, review_counters
+
+
+class ReviewQuerySet(models.QuerySet):
+    """
+    Review queryset with rating statistics computed by conditional aggregation.
+    """
+
+    @staticmethod
+    def _rating_aggregates():
+        return {
+            "review_count": models.Count("id"),
+            "rating_count": models.Count("rating"),
+            "rating_sum": models.Sum("rating", default=0),
+            **{
+                f"rating_{value}": models.Count("id", filter=models.Q(rating=value))
+                for value in range(1, 6)
+            },
+        }
+
+    def rating_stats(self):
+        """
+        Returns review count, rating count, rating sum and the five rating buckets
+        of the matched reviews in a single query.
+        """
+        return self.aggregate(**self._rating_aggregates())
+
+    async def arating_stats(self):
+        """
+        Async variant of `rating_stats`.
+        """
+        return await self.aaggregate(**self._rating_aggregates())
+
+    def rating_stats_by_book(self):
+        """
+        Returns the same statistics as `rating_stats`, one row per `book_id`.
+        """
+        return self.order_by().values("book_id").annotate(**self._rating_aggregates())
+
+    def upsert_for_user(self, user, entries):
+        """
+        Creates or updates `user`'s reviews of several books.
+
+        `entries` maps book ids to `(rating, comment)`. The reviews are written with
+        one `INSERT ... ON CONFLICT DO UPDATE` on `unique_book_user_review` and the
+        books' counters are adjusted with one UPDATE, since bulk writes do not send
+        the signals that maintain them. Returns the saved reviews, as stored, and the
+        ids of the books the user had not reviewed before.
+        """
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            previous = dict(
+                self.using(using)
+                .select_for_update()
+                .filter(user=user, book_id__in=entries)
+                .values_list("book_id", "rating")
+            )
+            self.using(using).bulk_create(
+                [
+                    self.model(
+                        user=user, book_id=book_id, rating=rating, comment=comment
+                    )
+                    for book_id, (rating, comment) in entries.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["book", "user"],
+                update_fields=["rating", "comment", "modified"],
+            )
+            # bulk_create returns the instances it was given, whose `created` is
+            # wrong for updated rows (and whose id may be unset); read back the rows.
+            reviews = list(self.using(using).filter(user=user, book_id__in=entries))
+
+            deltas = {}
+            for book_id, (rating, _) in entries.items():
+                changes = review_counters(rating)
+                if book_id in previous:
+                    for field, delta in review_counters(previous[book_id], -1).items():
+                        changes[field] = changes.get(field, 0) + delta
+                deltas[book_id] = {
+                    field: delta for field, delta in changes.items() if delta
+                }
+            BookStats.objects.db_manager(using).apply_deltas(deltas)
+
+        return reviews, set(entries) - set(previous)
+
+    def upsert(self, user, book_id, rating, comment):
+        """
+        Creates or updates `user`'s review of a book with one statement.
+
+        The review is written with `INSERT ... SELECT ... WHERE` the book exists
+        `ON CONFLICT (book_id, user_id) DO UPDATE ... RETURNING`, so neither the book
+        nor the review is read first. The statement also returns whether the row was
+        inserted: an update keeps the stored `created`, so only an inserted row
+        carries the `created` value passed in. The previous version is taken off the
+        book's counters by a subquery UPDATE before the write, as in the `pre_save`
+        signal.
+
+        Returns the saved review and whether it was created, or `(None, False)` when
+        the book does not exist. Model signals are not sent.
+        """
+        using = self._db or router.db_for_write(self.model)
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        opts = self.model._meta
+        book_opts = opts.get_field("book").related_model._meta
+        created = opts.get_field("created")
+        now = created.get_db_prep_save(timezone.now(), connection)
+
+        def column(name):
+            return quote(opts.get_field(name).column)
+
+        sql = (
+            f"INSERT INTO {quote(opts.db_table)} ("
+            + ", ".join(
+                column(name)
+                for name in ("created", "modified", "book", "user", "rating", "comment")
+            )
+            + f") SELECT %s, %s, %s, %s, %s, %s WHERE EXISTS "
+            f"(SELECT 1 FROM {quote(book_opts.db_table)} "
+            f"WHERE {quote(book_opts.pk.column)} = %s) "
+            f"ON CONFLICT ({column('book')}, {column('user')}) DO UPDATE SET "
+            + ", ".join(
+                f"{column(name)} = EXCLUDED.{column(name)}"
+                for name in ("rating", "comment", "modified")
+            )
+            + f" RETURNING *, {column('created')} = %s AS {quote('inserted')}"
+        )
+        params = [now, now, book_id, user.pk, rating, comment, book_id, now]
+
+        with transaction.atomic(using=using):
+            BookStats.objects.db_manager(using).retract_review(
+                self.using(using).filter(book_id=book_id, user=user)
+            )
+            saved = list(self.model.objects.raw(sql, params, using=using))
+            if not saved:
+                return None, False
+            review = saved[0]
+            BookStats.objects.db_manager(using).add_review(book_id, rating)
+
+        return review, bool(review.inserted)
+
 
 class Review(TimeStampMixin):
     """
@@ -58,6 +200,8 @@ class Review(TimeStampMixin):
         null=True,
     )
 
+    objects = ReviewQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Review")
         verbose_name_plural = _("Reviews")
@@ -65,6 +209,10 @@ class Review(TimeStampMixin):
         indexes = [
             models.Index(fields=["created"]),
             models.Index(fields=["book", "user"]),
+            models.Index(
+                fields=["book", "created", "id"], name="review_book_created_id_idx"
+            ),
+            models.Index(fields=["book", "modified"], name="review_book_modified_idx"),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -0,0 +1,286 @@
+"""
+Full-text search over books and reviews using SQLite FTS5.
+
+Two FTS5 tables mirror the searchable text:
+
+- `warehouse_book_fts(title, summary)`, whose rowid is the book id.
+- `warehouse_review_fts(comment, book_id)`, whose rowid is the review id.
+
+They are created after `migrate`, kept in sync by the signal handlers in
+`warehouse.signals` and can be rebuilt with the `rebuild_search_index` management
+command. Results are ranked with BM25. On database backends other than SQLite, search
+falls back to case-insensitive `LIKE` matching on the book title and summary.
+"""
+
+import logging
+import re
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.models import Q
+
+from .models import Book, Review
+
+
+logger = logging.getLogger(__name__)
+
+BOOK_FTS_TABLE = "warehouse_book_fts"
+REVIEW_FTS_TABLE = "warehouse_review_fts"
+
+# BM25 column weights of the book table: (title, summary).
+BOOK_WEIGHTS = (10.0, 1.0)
+
+# Review matches rank below book matches of the same BM25 score.
+REVIEW_RANK_FACTOR = 0.5
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def is_supported(using=DEFAULT_DB_ALIAS):
+    """
+    Returns whether the database supports the FTS5 index.
+    """
+    return connections[using].vendor == "sqlite"
+
+
+def create_tables(using=DEFAULT_DB_ALIAS):
+    """
+    Creates the FTS5 tables if they do not exist yet.
+    """
+    if not is_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {BOOK_FTS_TABLE} USING fts5("
+            "title, summary, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {REVIEW_FTS_TABLE} USING fts5("
+            "comment, book_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+
+def rebuild(using=DEFAULT_DB_ALIAS):
+    """
+    Recreates both FTS5 tables from the books and reviews tables.
+
+    Returns the number of indexed books and reviews.
+    """
+    if not is_supported(using):
+        return 0, 0
+    book_table = Book._meta.db_table
+    review_table = Review._meta.db_table
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {BOOK_FTS_TABLE}")
+        cursor.execute(f"DROP TABLE IF EXISTS {REVIEW_FTS_TABLE}")
+        create_tables(using)
+        cursor.execute(
+            f"INSERT INTO {BOOK_FTS_TABLE} (rowid, title, summary) "
+            f"SELECT id, title, COALESCE(summary, '') FROM {book_table}"
+        )
+        books = cursor.rowcount
+        cursor.execute(
+            f"INSERT INTO {REVIEW_FTS_TABLE} (rowid, comment, book_id) "
+            f"SELECT id, comment, book_id FROM {review_table} "
+            "WHERE comment IS NOT NULL AND comment != ''"
+        )
+        reviews = cursor.rowcount
+        cursor.execute(
+            f"INSERT INTO {BOOK_FTS_TABLE}({BOOK_FTS_TABLE}) VALUES ('optimize')"
+        )
+        cursor.execute(
+            f"INSERT INTO {REVIEW_FTS_TABLE}({REVIEW_FTS_TABLE}) VALUES ('optimize')"
+        )
+    return books, reviews
+
+
+def _is_index_unavailable(error):
+    """
+    Returns whether `error` means the FTS5 module or tables are missing.
+    """
+    message = str(error)
+    return message == "no such module: fts5" or message in {
+        f"no such table: {BOOK_FTS_TABLE}",
+        f"no such table: {REVIEW_FTS_TABLE}",
+    }
+
+
+def _execute(using, statements, many=False):
+    """
+    Runs index update statements, given as `(sql, params)` pairs; with `many`, each
+    `params` is a list of parameter sets run with `executemany`.
+
+    When SQLite lacks FTS5 or the index tables are missing, the update is skipped
+    and logged, so writes to books and reviews still succeed; the index must then
+    be rebuilt. Any other database error propagates.
+    """
+    if not is_supported(using):
+        return
+    try:
+        with connections[using].cursor() as cursor:
+            for sql, params in statements:
+                if many:
+                    cursor.executemany(sql, params)
+                else:
+                    cursor.execute(sql, params)
+    except OperationalError as e:
+        if not _is_index_unavailable(e):
+            raise
+        logger.error(
+            "Search index not updated (%s); run `python manage.py "
+            "rebuild_search_index` with an SQLite build that includes FTS5.",
+            str(e),
+        )
+
+
+def index_book(book, using=DEFAULT_DB_ALIAS):
+    """
+    Adds or replaces a book in the search index.
+    """
+    _execute(
+        using,
+        [
+            (f"DELETE FROM {BOOK_FTS_TABLE} WHERE rowid = %s", [book.pk]),
+            (
+                f"INSERT INTO {BOOK_FTS_TABLE} (rowid, title, summary) "
+                "VALUES (%s, %s, %s)",
+                [book.pk, book.title, book.summary or ""],
+            ),
+        ],
+    )
+
+
+def index_books(books, using=DEFAULT_DB_ALIAS):
+    """
+    Adds or replaces many books, given as `(id, title, summary)` tuples, in the
+    search index with two batched statements.
+    """
+    books = [(book_id, title, summary or "") for book_id, title, summary in books]
+    _execute(
+        using,
+        [
+            (
+                f"DELETE FROM {BOOK_FTS_TABLE} WHERE rowid = %s",
+                [(book_id,) for book_id, _, _ in books],
+            ),
+            (
+                f"INSERT INTO {BOOK_FTS_TABLE} (rowid, title, summary) "
+                "VALUES (%s, %s, %s)",
+                books,
+            ),
+        ],
+        many=True,
+    )
+
+
+def unindex_book(book_id, using=DEFAULT_DB_ALIAS):
+    """
+    Removes a book from the search index.
+    """
+    _execute(using, [(f"DELETE FROM {BOOK_FTS_TABLE} WHERE rowid = %s", [book_id])])
+
+
+def index_review(review, using=DEFAULT_DB_ALIAS):
+    """
+    Adds or replaces a review comment in the search index.
+    """
+    statements = [(f"DELETE FROM {REVIEW_FTS_TABLE} WHERE rowid = %s", [review.pk])]
+    if review.comment:
+        statements.append(
+            (
+                f"INSERT INTO {REVIEW_FTS_TABLE} (rowid, comment, book_id) "
+                "VALUES (%s, %s, %s)",
+                [review.pk, review.comment, review.book_id],
+            )
+        )
+    _execute(using, statements)
+
+
+def index_reviews(reviews, using=DEFAULT_DB_ALIAS):
+    """
+    Adds or replaces many review comments in the search index with two batched
+    statements.
+    """
+    _execute(
+        using,
+        [
+            (
+                f"DELETE FROM {REVIEW_FTS_TABLE} WHERE rowid = %s",
+                [(review.pk,) for review in reviews],
+            ),
+            (
+                f"INSERT INTO {REVIEW_FTS_TABLE} (rowid, comment, book_id) "
+                "VALUES (%s, %s, %s)",
+                [
+                    (review.pk, review.comment, review.book_id)
+                    for review in reviews
+                    if review.comment
+                ],
+            ),
+        ],
+        many=True,
+    )
+
+
+def unindex_review(review_id, using=DEFAULT_DB_ALIAS):
+    """
+    Removes a review comment from the search index.
+    """
+    _execute(using, [(f"DELETE FROM {REVIEW_FTS_TABLE} WHERE rowid = %s", [review_id])])
+
+
+def to_match_query(text):
+    """
+    Turns free text into an FTS5 query matching every word, the last one as a prefix.
+
+    Words are quoted so FTS5 operators in user input are treated as plain text.
+    Returns an empty string when the text has no searchable words.
+    """
+    tokens = TOKEN_RE.findall(text)
+    if not tokens:
+        return ""
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_book_ids(text, limit=20, include_reviews=False, using=DEFAULT_DB_ALIAS):
+    """
+    Returns the ids of the books matching `text`, best match first.
+    """
+    if not is_supported(using):
+        words = TOKEN_RE.findall(text)
+        if not words:
+            return []
+        condition = Q()
+        for word in words:
+            condition &= Q(title__icontains=word) | Q(summary__icontains=word)
+        return list(
+            Book.objects.using(using)
+            .filter(condition)
+            .order_by("title")
+            .values_list("id", flat=True)[:limit]
+        )
+
+    match = to_match_query(text)
+    if not match:
+        return []
+
+    sql = (
+        f"SELECT rowid AS book_id, bm25({BOOK_FTS_TABLE}, %s, %s) AS rank "
+        f"FROM {BOOK_FTS_TABLE} WHERE {BOOK_FTS_TABLE} MATCH %s"
+    )
+    params = [*BOOK_WEIGHTS, match]
+    if include_reviews:
+        sql = (
+            f"SELECT book_id, MIN(rank) AS rank FROM ({sql} UNION ALL "
+            f"SELECT book_id, bm25({REVIEW_FTS_TABLE}) * %s AS rank "
+            f"FROM {REVIEW_FTS_TABLE} WHERE {REVIEW_FTS_TABLE} MATCH %s) "
+            "GROUP BY book_id"
+        )
+        params += [REVIEW_RANK_FACTOR, match]
+    sql += " ORDER BY rank LIMIT %s"
+    params.append(limit)
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+        return [int(row[0]) for row in cursor.fetchall()]
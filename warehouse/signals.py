@@ -0,0 +1,163 @@
+"""
+Signal handlers that keep derived book data in sync with writes.
+
+Counters in BookStats are updated in the same transaction as the write that changes
+them, whether it comes from the API, the admin or a cascading delete. The full-text
+search index is updated in the same transaction. Cached book payloads are invalidated
+once that transaction commits.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import search
+from .autocomplete import title_index
+from .cache import book_detail_cache, book_list_cache, user_bookmarks_cache
+from .models import Book, Bookmark, BookStats, Review
+
+
+@receiver(post_save, sender=Book)
+def create_book_stats(sender, instance, created, raw=False, **kwargs):
+    """
+    Creates the statistics row of a new book.
+    """
+    if created and not raw:
+        BookStats.objects.ensure([instance.pk])
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_book(sender, instance, **kwargs):
+    """
+    Invalidates the cached payloads of a changed or deleted book.
+    """
+    book_detail_cache.bump_on_commit(instance.pk)
+    book_list_cache.bump_on_commit("all")
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_reviewed_book(sender, instance, **kwargs):
+    """
+    Invalidates the cached payloads of the book whose reviews changed.
+    """
+    book_detail_cache.bump_on_commit(instance.book_id)
+
+
+@receiver(post_save, sender=Bookmark)
+@receiver(post_delete, sender=Bookmark)
+def invalidate_bookmarks(sender, instance, **kwargs):
+    """
+    Invalidates the user's cached bookmark set.
+
+    The public book list is not invalidated: its bookmark counts are allowed to lag
+    by up to `BOOK_LIST_CACHE_TIMEOUT` seconds, so one user's bookmark does not
+    evict the pages cached for everyone.
+    """
+    user_bookmarks_cache.bump_on_commit(instance.user_id)
+
+
+@receiver(post_save, sender=Bookmark)
+def count_created_bookmark(sender, instance, created, raw=False, **kwargs):
+    """
+    Increments the bookmark count of the bookmarked book.
+    """
+    if created and not raw:
+        BookStats.objects.add_bookmarks(instance.book_id, 1)
+
+
+@receiver(post_delete, sender=Bookmark)
+def count_deleted_bookmark(sender, instance, **kwargs):
+    """
+    Decrements the bookmark count of the unbookmarked book.
+    """
+    BookStats.objects.add_bookmarks(instance.book_id, -1)
+
+
+@receiver(pre_save, sender=Review)
+def retract_updated_review(sender, instance, raw=False, **kwargs):
+    """
+    Removes the stored version of an updated review from its book's counters.
+
+    The new version is added back by `count_saved_review`.
+    """
+    if not raw and not instance._state.adding:
+        BookStats.objects.retract_review(Review.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, raw=False, **kwargs):
+    """
+    Adds a created or updated review to its book's counters.
+    """
+    if not raw:
+        BookStats.objects.add_review(instance.book_id, instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, **kwargs):
+    """
+    Removes a deleted review from its book's counters.
+    """
+    BookStats.objects.add_review(instance.book_id, instance.rating, sign=-1)
+
+
+def create_search_tables(sender, using, **kwargs):
+    """
+    Creates the full-text search tables after the warehouse app is migrated.
+    """
+    search.create_tables(using)
+
+
+@receiver(post_save, sender=Book)
+def index_saved_book(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Adds a created or updated book to the search index.
+    """
+    if not raw:
+        search.index_book(instance, using)
+
+
+@receiver(post_delete, sender=Book)
+def unindex_deleted_book(sender, instance, using=None, **kwargs):
+    """
+    Removes a deleted book from the search index.
+    """
+    search.unindex_book(instance.pk, using)
+
+
+@receiver(post_save, sender=Review)
+def index_saved_review(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Adds a created or updated review comment to the search index.
+    """
+    if not raw:
+        search.index_review(instance, using)
+
+
+@receiver(post_delete, sender=Review)
+def unindex_deleted_review(sender, instance, using=None, **kwargs):
+    """
+    Removes a deleted review comment from the search index.
+    """
+    search.unindex_review(instance.pk, using)
+
+
+@receiver(post_save, sender=Book)
+def autocomplete_saved_book(sender, instance, raw=False, **kwargs):
+    """
+    Adds a created or renamed book to this process's autocomplete index on commit.
+    """
+    if not raw:
+        book_id, title = instance.pk, instance.title
+        transaction.on_commit(lambda: title_index.add(book_id, title))
+
+
+@receiver(post_delete, sender=Book)
+def autocomplete_deleted_book(sender, instance, **kwargs):
+    """
+    Removes a deleted book from this process's autocomplete index on commit.
+    """
+    book_id = instance.pk
+    transaction.on_commit(lambda: title_index.remove(book_id))
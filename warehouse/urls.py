@@ -1,13 +1,22 @@
 """urls"""
 
-from django.urls import path
+from django.urls import path, re_path
 
 from rest_framework.routers import DefaultRouter
 
 from .api.v1.views import (
+    AsyncBookDetailView,
+    AsyncBookListView,
+    AsyncBookReviewListView,
+    BookAutocompleteAPIView,
     BookDetailAPIView,
+    BookExportAPIView,
     BookListAPIView,
     BookmarkAPIView,
+    BookmarkBatchAPIView,
+    BookReviewListAPIView,
+    BookSearchAPIView,
+    ReviewBatchAPIView,
     SubmitReviewAPIView,
 )
 
@@ -17,7 +26,24 @@ urlpatterns = router.urls
 
 urlpatterns = [
     path("", BookListAPIView.as_view(), name="book-list"),
+    path("search/", BookSearchAPIView.as_view(), name="book-search"),
+    path("autocomplete/", BookAutocompleteAPIView.as_view(), name="book-autocomplete"),
+    path("export/", BookExportAPIView.as_view(), name="book-export"),
+    re_path(
+        r"^bookmarks/batch/?$", BookmarkBatchAPIView.as_view(), name="bookmark-batch"
+    ),
+    re_path(r"^reviews/batch/?$", ReviewBatchAPIView.as_view(), name="review-batch"),
     path("<int:pk>/", BookDetailAPIView.as_view(), name="book-detail"),
     path("<int:book_id>/bookmark/", BookmarkAPIView.as_view(), name="bookmark"),
+    path(
+        "<int:book_id>/reviews/", BookReviewListAPIView.as_view(), name="book-reviews"
+    ),
     path("<int:book_id>/review/", SubmitReviewAPIView.as_view(), name="submit-review"),
+    path("async/", AsyncBookListView.as_view(), name="async-book-list"),
+    path("async/<int:pk>/", AsyncBookDetailView.as_view(), name="async-book-detail"),
+    path(
+        "async/<int:book_id>/reviews/",
+        AsyncBookReviewListView.as_view(),
+        name="async-book-reviews",
+    ),
 ]